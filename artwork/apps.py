@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ArtworkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artwork'
+
+    def ready(self):
+        from . import signals  # noqa: F401  (featured feed cache invalidation)
+        from .cache import artwork_cache
+
+        artwork_cache.connect()
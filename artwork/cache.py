@@ -0,0 +1,85 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from users.caching import ModelCache
+
+from .models import Artwork
+
+FEATURED_VERSION_KEY = "artwork:featured:version"
+
+# Detail pages. Like counters and moderation change rows through queryset.update(), which
+# bypasses the save/delete signals, so reads pass the updated_at they already looked up.
+artwork_cache = ModelCache(Artwork, defer=("search_vector",), stamp_field="updated_at")
+
+
+def featured_version():
+    cache.add(FEATURED_VERSION_KEY, 1, timeout=None)
+    return cache.get(FEATURED_VERSION_KEY, 1)
+
+
+def featured_cache_key(request):
+    """Key for one rendering of the featured feed.
+
+    The payload holds absolute image URLs and pagination links, so the scheme, host and
+    query string are part of the key alongside the current version stamp.
+    """
+    url = request.build_absolute_uri()
+    digest = hashlib.md5(url.encode("utf-8")).hexdigest()
+    return f"artwork:featured:v{featured_version()}:{digest}"
+
+
+def get_featured(request):
+    return cache.get(featured_cache_key(request))
+
+
+def featured_ids_key():
+    return f"artwork:featured:v{featured_version()}:ids"
+
+
+def featured_timeout():
+    # The version stamp is per process under locmem: a bump only retires this worker's
+    # renderings, so the others' must expire on their own before they go stale for long
+    if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+        return settings.FEATURED_ARTWORKS_LOCAL_CACHE_TIMEOUT
+    return settings.FEATURED_ARTWORKS_CACHE_TIMEOUT
+
+
+def set_featured(request, data):
+    timeout = featured_timeout()
+    cache.set(featured_cache_key(request), data, timeout)
+    # Remember which artworks this version shows, so a like elsewhere doesn't retire it
+    items = data.get("results", []) if isinstance(data, dict) else data
+    shown = cache.get(featured_ids_key(), set()) | {item["id"] for item in items}
+    cache.set(featured_ids_key(), shown, timeout)
+
+
+def _bump_featured_version():
+    try:
+        cache.incr(FEATURED_VERSION_KEY)
+    except ValueError:
+        # Evicted or never set: any value newer than what readers last saw will do
+        cache.add(FEATURED_VERSION_KEY, 2, timeout=None)
+
+
+def invalidate_featured():
+    """Retire every cached rendering of the featured feed.
+
+    Bumping the version (rather than deleting keys) makes all old entries unreachable at
+    once. It runs after the surrounding transaction commits, so a concurrent request can't
+    re-cache the pre-change rows under the new version.
+    """
+    transaction.on_commit(_bump_featured_version)
+
+
+def invalidate_featured_likes(artwork_id):
+    """Retire the featured feed if it shows `artwork_id`, whose likes_count just changed.
+
+    Like counters move through queryset.update(), which sends no signal; this is called
+    from the like and unlike views instead.
+    """
+    if artwork_id in cache.get(featured_ids_key(), ()):
+        invalidate_featured()
@@ -0,0 +1,122 @@
+"""Near-duplicate detection for artwork submissions.
+
+Every artwork stores a 64-bit perceptual hash (see imaging.processing.difference_hash),
+computed by the image worker alongside the other upload metadata; the submission is
+flagged once its job has run (see artwork.signals). Hashes live in a per-process NumPy
+array; a query XORs the probe against all of them and counts differing bits in one
+vectorised pass (~0.1 ms per 100k artworks), which beats a pure-Python BK-tree by two
+orders of magnitude at the radius we use.
+"""
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+
+
+class HammingIndex:
+    """Append-only (hash, id) arrays searched by Hamming distance."""
+
+    def __init__(self, capacity=1024):
+        self.hashes = np.empty(capacity, dtype=np.uint64)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+
+    def add(self, value, item):
+        """Append (value, item); returns its position for replace()."""
+        if self.size == len(self.hashes):
+            self.hashes = np.resize(self.hashes, 2 * self.size)
+            self.ids = np.resize(self.ids, 2 * self.size)
+        self.hashes[self.size] = value
+        self.ids[self.size] = item
+        self.size += 1
+        return self.size - 1
+
+    def replace(self, position, value):
+        self.hashes[position] = value
+
+    def search(self, value, max_distance):
+        """[(distance, item)] for every item within max_distance of value, nearest first."""
+        distances = np.bitwise_count(self.hashes[:self.size] ^ np.uint64(value))
+        hits = np.flatnonzero(distances <= max_distance)
+        hits = hits[np.argsort(distances[hits], kind="stable")]
+        return [(int(distances[i]), int(self.ids[i])) for i in hits]
+
+
+class DuplicateIndex:
+    """Process-wide index of artwork hashes, topped up incrementally from the database.
+
+    Hashes written by other processes are picked up by `refresh()`: one query for rows
+    whose updated_at is at or after the newest one seen, less an overlap for transactions
+    that commit out of timestamp order. Going by updated_at rather than id also catches
+    hashes set later on old rows (retried jobs, backfill_perceptual_hashes). Deleted
+    artworks may linger in the index, so callers resolve the returned ids against the
+    database.
+    """
+    refresh_overlap = timedelta(minutes=1)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hashes = HammingIndex()
+        self.loaded = {}  # pk -> (position, digest)
+        self.since = None
+
+    def refresh(self):
+        from .models import Artwork
+
+        with self.lock:
+            rows = Artwork.objects.exclude(perceptual_hash="")
+            if self.since is not None:
+                rows = rows.filter(updated_at__gte=self.since - self.refresh_overlap)
+            rows = rows.order_by("updated_at", "pk").values_list("pk", "perceptual_hash", "updated_at")
+            for pk, digest, updated_at in rows.iterator():
+                position, loaded = self.loaded.get(pk, (None, None))
+                if position is None:
+                    self.loaded[pk] = (self.hashes.add(int(digest, 16), pk), digest)
+                elif loaded != digest:  # The image was replaced
+                    self.hashes.replace(position, int(digest, 16))
+                    self.loaded[pk] = (position, digest)
+                self.since = updated_at if self.since is None else max(self.since, updated_at)
+
+    def search(self, digest, max_distance=None, exclude=None):
+        if not digest:
+            return []
+        if max_distance is None:
+            max_distance = settings.ARTWORK_DUPLICATE_MAX_DISTANCE
+        self.refresh()
+        with self.lock:
+            matches = self.hashes.search(int(digest, 16), max_distance)
+        return [(distance, pk) for distance, pk in matches if pk != exclude]
+
+    def reset(self):
+        with self.lock:
+            self.hashes = HammingIndex()
+            self.loaded = {}
+            self.since = None
+
+
+duplicate_index = DuplicateIndex()
+
+
+def nearest_duplicate(digest, before):
+    """Id of the closest artwork older than `before` within the configured distance, or None.
+
+    Only older work counts, so the original of a pair is never the one flagged. The index
+    can still hold deleted artworks, so the matches are checked against the database and
+    the nearest one that still exists wins.
+    """
+    from .models import Artwork
+
+    matches = [pk for _, pk in duplicate_index.search(digest) if pk < before]
+    if not matches:
+        return None
+    existing = set(Artwork.objects.filter(pk__in=matches).values_list("pk", flat=True))
+    return next((pk for pk in matches if pk in existing), None)
+
+
+def newer_duplicates(digest, after):
+    """Ids of artworks newer than `after` within the configured distance, nearest first.
+
+    Their jobs may have finished before this one, when `after` had no hash to match yet.
+    """
+    return [pk for _, pk in duplicate_index.search(digest) if pk > after]
@@ -0,0 +1,120 @@
+"""Streaming ZIP exports of artwork collections.
+
+The archive is produced while it is being sent: ZipFile writes into a write-only buffer
+(so it uses data descriptors instead of seeking back), and the generator hands the
+buffer's bytes to the response after every chunk. Images are copied 1 MiB at a time and
+stored uncompressed (they already are compressed), so memory stays flat however many
+gigabytes are exported; only the central directory (~100 bytes per entry) accumulates.
+"""
+import csv
+import io
+import json
+import os
+import zipfile
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.text import slugify
+
+from .models import Artwork
+from .serializers import ArtworkValuesSerializer
+
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_FORMATS = ("json", "csv")
+MANIFEST_FIELDS = [
+    'id', 'title', 'description', 'artist', 'artist_name', 'category', 'approval_status',
+    'submission_date', 'likes_count', 'image_width', 'image_height', 'dominant_color',
+]
+
+
+class _ZipBuffer:
+    """Write-only, unseekable file object that collects what ZipFile writes until drained."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def archive_name(artwork_id, title, image_name):
+    _, extension = os.path.splitext(image_name)
+    return f"images/{artwork_id}-{slugify(title)[:60] or 'artwork'}{extension.lower()}"
+
+
+def stream_archive(queryset, manifest_format="json", context=None):
+    """Yield the bytes of a ZIP holding every image in `queryset` plus a manifest.
+
+    Images come first, in id order; the manifest (one row per artwork, with the archive
+    path of its image, or "" when the file was missing) is written last from a second
+    pass over the same rows, so neither pass holds the collection in memory.
+    """
+    return (chunk for chunk in _archive_chunks(queryset, manifest_format, context) if chunk)
+
+
+def _archive_chunks(queryset, manifest_format, context):
+    storage = Artwork._meta.get_field('image').storage
+    buffer = _ZipBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+    missing = set()  # Usually empty; the archive paths themselves are recomputed for the manifest
+    last_id = 0
+
+    rows = queryset.order_by('pk').values_list('pk', 'title', 'image').iterator(chunk_size=500)
+    for pk, title, image in rows:
+        last_id = pk
+        if not image:
+            continue
+        try:
+            size = storage.size(image)
+            source = storage.open(image, 'rb')
+        except OSError:
+            missing.add(pk)  # Listed in the manifest without a file
+            continue
+        name = archive_name(pk, title, image)
+        info = zipfile.ZipInfo(name)
+        info.file_size = size  # Lets ZipFile pick ZIP64 headers for entries over 4 GB
+        with source, archive.open(info, mode="w") as entry:
+            for chunk in source.chunks(CHUNK_SIZE):
+                entry.write(chunk)
+                yield buffer.drain()
+        yield buffer.drain()
+
+    manifest = queryset.order_by('pk').filter(pk__lte=last_id)
+    serializer = ArtworkValuesSerializer(context=context, keep=MANIFEST_FIELDS)
+    info = zipfile.ZipInfo(f"manifest.{manifest_format}")
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with archive.open(info, mode="w") as entry:
+        text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+        writer = csv.writer(text) if manifest_format == "csv" else None
+        if writer is not None:
+            writer.writerow(MANIFEST_FIELDS + ['file'])
+        else:
+            text.write("[")
+        separator = "\n"
+        values = manifest.values(*serializer.lookups, 'image').iterator(chunk_size=500)
+        while batch := list(islice(values, 500)):
+            for row, item in zip(batch, serializer.to_representation(batch)):
+                exported = row['image'] and row['id'] not in missing
+                item['file'] = archive_name(row['id'], row['title'], row['image']) if exported else ""
+                if writer is not None:
+                    writer.writerow([item[field] for field in MANIFEST_FIELDS + ['file']])
+                else:
+                    text.write(separator + json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False))
+                    separator = ",\n"
+            text.flush()
+            yield buffer.drain()
+        if writer is None:
+            text.write("\n]\n")
+        text.flush()
+        text.detach()
+    archive.close()
+    yield buffer.drain()
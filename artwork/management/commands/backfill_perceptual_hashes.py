@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from artwork.duplicates import HammingIndex, duplicate_index
+from artwork.models import Artwork
+from imaging.processing import hash_image
+from imaging.worker import DECODE_ERRORS
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute perceptual hashes for artworks that lack one and flag each against the older "
+        "artworks it nearly duplicates. Running processes pick the new hashes up on their next search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--max-distance", type=int, default=None, help="Defaults to ARTWORK_DUPLICATE_MAX_DISTANCE.")
+
+    def handle(self, *args, **options):
+        max_distance = options["max_distance"]
+        if max_distance is None:
+            max_distance = settings.ARTWORK_DUPLICATE_MAX_DISTANCE
+        storage = Artwork._meta.get_field("image").storage
+
+        # Local index: rows hashed earlier in this run are matched before their batch is written
+        index = HammingIndex()
+        for pk, digest in Artwork.objects.exclude(perceptual_hash="").values_list("pk", "perceptual_hash").iterator():
+            index.add(int(digest, 16), pk)
+
+        hashed = flagged = unreadable = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Artwork.objects.filter(pk__gt=last_pk, perceptual_hash="")
+                .exclude(image="")
+                .order_by("pk")
+                .only("pk", "image", "possible_duplicate_of")[:options["batch_size"]]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            now = timezone.now()
+            changed = []
+            for artwork in batch:
+                try:
+                    with storage.open(artwork.image.name, "rb") as fh:
+                        digest = hash_image(fh)
+                except (FileNotFoundError, *DECODE_ERRORS):
+                    unreadable += 1
+                    continue
+                value = int(digest, 16)
+                # Flag against older work only, so the original of a pair is never the one marked
+                older = [pk for _, pk in index.search(value, max_distance) if pk < artwork.pk]
+                if older and artwork.possible_duplicate_of_id is None:
+                    artwork.possible_duplicate_of_id = older[0]
+                    flagged += 1
+                index.add(value, artwork.pk)
+                artwork.perceptual_hash = digest
+                artwork.updated_at = now
+                changed.append(artwork)
+            Artwork.objects.bulk_update(changed, ["perceptual_hash", "possible_duplicate_of", "updated_at"])
+            hashed += len(changed)
+
+        duplicate_index.reset()
+        self.stdout.write(self.style.SUCCESS(
+            f"Hashed {hashed} artwork(s), flagged {flagged} possible duplicate(s), {unreadable} unreadable."
+        ))
@@ -0,0 +1,152 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from artwork.models import Artwork, Like
+from notifications.models import Notification
+from users.models import CustomUser
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large synthetic dataset inside a transaction, then report EXPLAIN plans and timings "
+        "for the hot artwork/like/notification queries with and without the composite indexes. "
+        "Everything is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--artworks", type=int, default=50000)
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--likes", type=int, default=100000)
+        parser.add_argument("--notifications", type=int, default=100000)
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query (median is reported).")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.repeat = options["repeat"]
+        try:
+            with transaction.atomic():
+                users = self.seed(options)
+                probe_user = users[len(users) // 2]
+                queries = self.queries(probe_user)
+
+                after = self.measure(queries)
+                self.drop_indexes()
+                before = self.measure(queries)
+                self.report(queries, before, after)
+                raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.SUCCESS("Benchmark data rolled back."))
+
+    def seed(self, options):
+        rng = random.Random(options["seed"])
+        now = timezone.now()
+        self.stdout.write("Seeding...")
+
+        users = CustomUser.objects.bulk_create(
+            CustomUser(username=f"bench{i}", email=f"bench{i}@example.com", role="member")
+            for i in range(options["users"])
+        )
+        categories = [choice for choice, _ in Artwork.CATEGORY_CHOICES]
+        statuses = ["approved"] * 6 + ["pending"] * 3 + ["rejected"]
+        artworks = Artwork.objects.bulk_create(
+            (
+                Artwork(
+                    title=f"Bench artwork {i}",
+                    description="Synthetic benchmark row",
+                    image="artworks/bench.jpg",
+                    artist=rng.choice(users),
+                    approval_status=rng.choice(statuses),
+                    category=rng.choice(categories),
+                    processing_status="ready",
+                )
+                for i in range(options["artworks"])
+            ),
+            batch_size=2000,
+        )
+        # bulk_create ignores auto_now_add overrides, so spread the submission dates afterwards
+        for artwork in artworks:
+            artwork.submission_date = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+        Artwork.objects.bulk_update(artworks, ["submission_date"], batch_size=2000)
+
+        pairs = {(rng.randrange(len(users)), rng.randrange(len(artworks))) for _ in range(options["likes"])}
+        Like.objects.bulk_create(
+            (Like(user=users[u], artwork=artworks[a]) for u, a in pairs),
+            batch_size=5000,
+        )
+        Notification.objects.bulk_create(
+            (
+                Notification(
+                    recipient=rng.choice(users),
+                    message="Benchmark notification",
+                    notification_type="event_update",
+                    read=rng.random() < 0.7,
+                )
+                for _ in range(options["notifications"])
+            ),
+            batch_size=5000,
+        )
+        self.analyze()
+        return users
+
+    def queries(self, user):
+        return {
+            "featured": lambda: Artwork.objects.filter(approval_status="approved").order_by("-submission_date")[:11],
+            "gallery_page": lambda: Artwork.objects.order_by("-submission_date", "-id")[:10],
+            "moderation_queue": lambda: Artwork.objects.filter(approval_status="pending").order_by("submission_date")[:50],
+            "member_stats": lambda: Artwork.objects.filter(artist=user, approval_status="approved").values("artist").annotate(n=Count("id")),
+            "category_analytics": lambda: Artwork.objects.values("category").annotate(
+                total=Count("id"),
+                approved=Count("id", filter=models.Q(approval_status="approved")),
+            ).order_by("category"),
+            "user_likes": lambda: Like.objects.filter(user=user).order_by("-created_at")[:50],
+            "notifications": lambda: Notification.objects.filter(recipient=user).order_by("-created_at")[:20],
+            "unread_count": lambda: Notification.objects.filter(recipient=user, read=False).values("recipient").annotate(n=Count("id")),
+        }
+
+    def measure(self, queries):
+        results = {}
+        for name, build in queries.items():
+            timings = []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = (statistics.median(timings), build().explain())
+        return results
+
+    def drop_indexes(self):
+        # Plain DROP INDEX: transactional on PostgreSQL and SQLite, so the rollback restores them
+        with connection.cursor() as cursor:
+            for model in (Artwork, Like, Notification):
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+        self.analyze()
+
+    def analyze(self):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+    def report(self, queries, before, after):
+        for name in queries:
+            before_ms, before_plan = before[name]
+            after_ms, after_plan = after[name]
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{name}: {before_ms:.2f} ms without indexes -> {after_ms:.2f} ms with indexes ({speedup:.1f}x)"
+            ))
+            self.stdout.write("  plan without indexes:")
+            self.stdout.write("    " + before_plan.replace("\n", "\n    "))
+            self.stdout.write("  plan with indexes:")
+            self.stdout.write("    " + after_plan.replace("\n", "\n    "))
@@ -0,0 +1,97 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from artwork.models import Artwork, Like
+from artwork.views import ArtworkViewSet
+from notifications.models import Notification
+from notifications.views import NotificationViewSet
+from users import renderers
+from users.models import ActivityLog, CustomUser
+from users.views import ActivityLogListView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list throughput of the values()/FastJSONRenderer path against ModelSerializer + "
+        "JSONRenderer for the artwork, notification and activity-log endpoints. Seeds synthetic "
+        "rows inside a transaction and rolls everything back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Rows seeded per endpoint.")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=200, help="Requests timed per path.")
+
+    def handle(self, *args, **options):
+        self.repeat = options["repeat"]
+        self.stdout.write(f"orjson: {'installed' if renderers.orjson is not None else 'not installed (stdlib fallback)'}")
+        try:
+            with transaction.atomic():
+                admin = self.seed(options["rows"])
+                page = {"page_size": options["page_size"]}
+                for name, view_class, actions, path in (
+                    ("artworks", ArtworkViewSet, {"get": "list"}, "/api/artwork/"),
+                    ("notifications", NotificationViewSet, {"get": "list"}, "/api/notifications/"),
+                    ("activity_logs", ActivityLogListView, None, "/api/users/activity-logs/"),
+                ):
+                    self.compare(name, view_class, actions, path, page, admin)
+                raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.SUCCESS("Benchmark data rolled back."))
+
+    def seed(self, rows):
+        admin = CustomUser.objects.create(username="bench-admin", email="bench-admin@example.com", role="admin", is_staff=True)
+        artworks = Artwork.objects.bulk_create(
+            Artwork(
+                title=f"Bench artwork {i}",
+                description="Synthetic benchmark row " * 8,
+                image=f"artworks/bench{i}.jpg",
+                artist=admin,
+                approval_status="approved",
+                processing_status="ready",
+                image_width=1600,
+                image_height=1200,
+                dominant_color="#336699",
+            )
+            for i in range(rows)
+        )
+        Like.objects.bulk_create(Like(user=admin, artwork=artwork) for artwork in artworks[::3])
+        Notification.objects.bulk_create(
+            Notification(recipient=admin, message=f"Benchmark notification {i}", notification_type="event_update")
+            for i in range(rows)
+        )
+        ActivityLog.objects.bulk_create(ActivityLog(user=admin, action="login", resource="Bench") for _ in range(rows))
+        return admin
+
+    def compare(self, name, view_class, actions, path, params, user):
+        args = (actions,) if actions else ()
+        current = view_class.as_view(*args, values_serializer_class=None, renderer_classes=[JSONRenderer])
+        fast = view_class.as_view(*args, renderer_classes=[renderers.FastJSONRenderer])
+
+        before = self.measure(current, path, params, user)
+        after = self.measure(fast, path, params, user)
+        speedup = before / after if after else float("inf")
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{name}: {1000 / before:.0f} req/s ({before:.2f} ms) ModelSerializer -> "
+            f"{1000 / after:.0f} req/s ({after:.2f} ms) values() + fast renderer ({speedup:.1f}x)"
+        ))
+
+    def measure(self, view, path, params, user):
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+        timings = []
+        for _ in range(self.repeat):
+            request = factory.get(path, params, HTTP_ACCEPT="application/json")
+            force_authenticate(request, user=user)
+            start = time.perf_counter()
+            view(request).render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
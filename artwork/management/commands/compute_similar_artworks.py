@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from artwork.similarity import compute_similar_artworks
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the co-like \"similar artworks\" table from every like on an approved artwork. "
+        "Run it periodically (e.g. nightly from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=None, help="Neighbours kept per artwork (defaults to SIMILAR_ARTWORKS_TOP_K).")
+        parser.add_argument("--max-pairs", type=int, default=2_000_000, help="Co-like pairs expanded per block; bounds peak memory.")
+        parser.add_argument("--min-co-likes", type=int, default=1, help="Ignore pairs liked together by fewer users.")
+
+    def handle(self, *args, **options):
+        count = compute_similar_artworks(
+            top_k=options["top_k"], max_pairs=options["max_pairs"], min_co_likes=options["min_co_likes"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} similar-artwork pair(s)."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from artwork.trending import compute_trending
+
+
+class Command(BaseCommand):
+    help = "Recompute the trending ranking from recent likes. Run it periodically (e.g. every 15 minutes from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--half-life-hours", type=float, default=None, help="Defaults to TRENDING_HALF_LIFE_HOURS.")
+        parser.add_argument("--window-days", type=int, default=None, help="Defaults to TRENDING_WINDOW_DAYS.")
+
+    def handle(self, *args, **options):
+        count = compute_trending(half_life_hours=options["half_life_hours"], window_days=options["window_days"])
+        self.stdout.write(self.style.SUCCESS(f"Scored {count} trending artwork(s)."))
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from artwork.models import UploadSession
+from artwork.uploads import discard_part_file
+
+
+class Command(BaseCommand):
+    help = "Delete resumable upload sessions (and their part files) that were abandoned or completed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=float, default=24, help="Age of the last activity before a session is purged.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        purged = 0
+        for session in UploadSession.objects.filter(updated_at__lt=cutoff).iterator():
+            discard_part_file(session)
+            session.delete()
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} upload session(s)."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from artwork import stats
+from artwork.models import Artwork, ArtworkCategoryStat
+
+
+class Command(BaseCommand):
+    help = "Recount the category analytics rollup (ArtworkCategoryStat) from the artwork table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Hold off artwork writes (reads continue) so none land between the count and the swap
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LOCK TABLE {Artwork._meta.db_table} IN SHARE MODE")
+            rows = stats.rebuild(Artwork, ArtworkCategoryStat)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} category rollup row(s)."))
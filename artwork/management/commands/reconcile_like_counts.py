@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from artwork.models import Artwork, Like
+
+
+class Command(BaseCommand):
+    help = "Recompute Artwork.likes_count from the Like table and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Artworks checked per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing it.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        checked = fixed = 0
+        last_pk = 0
+
+        while True:
+            batch = list(
+                Artwork.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "likes_count")[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            pks = [pk for pk, _ in batch]
+
+            with transaction.atomic():
+                # Lock the batch so concurrent likes can't interleave with the comparison
+                stored = dict(
+                    Artwork.objects.select_for_update().filter(pk__in=pks).values_list("pk", "likes_count")
+                )
+                actual = dict(
+                    Like.objects.filter(artwork_id__in=pks)
+                    .values("artwork_id")
+                    .annotate(total=Count("id"))
+                    .values_list("artwork_id", "total")
+                )
+                drifted = []
+                now = timezone.now()
+                for pk, likes_count in stored.items():
+                    total = actual.get(pk, 0)
+                    if likes_count != total:
+                        drifted.append(Artwork(pk=pk, likes_count=total, updated_at=now))
+                if drifted and not dry_run:
+                    Artwork.objects.bulk_update(drifted, ["likes_count", "updated_at"])
+
+            checked += len(batch)
+            fixed += len(drifted)
+
+        verb = "would be fixed" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} artworks, {fixed} {verb}."))
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:22
+
+from django.db import migrations, models
+
+
+def backfill_likes_count(apps, schema_editor):
+    Artwork = apps.get_model('artwork', 'Artwork')
+    counts = Artwork.objects.annotate(total=models.Count('likes')).filter(total__gt=0).values_list('pk', 'total')
+    for pk, total in counts.iterator():
+        Artwork.objects.filter(pk=pk).update(likes_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0004_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_likes_count, migrations.RunPython.noop),
+    ]
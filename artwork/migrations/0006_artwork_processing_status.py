@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+def mark_existing_ready(apps, schema_editor):
+    # Rows uploaded before the worker existed were never queued
+    Artwork = apps.get_model('artwork', 'Artwork')
+    Artwork.objects.update(processing_status='ready')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0005_artwork_likes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.RunPython(mark_existing_ready, migrations.RunPython.noop),
+    ]
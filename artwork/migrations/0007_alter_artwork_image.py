@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:27
+
+import imaging.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0006_artwork_processing_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artwork',
+            name='image',
+            field=models.ImageField(storage=imaging.storage.get_media_storage, upload_to='artworks/'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:29
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0007_alter_artwork_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('total_size', models.PositiveBigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('received_chunks', models.JSONField(default=list)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('category', models.CharField(choices=[('sketch', 'Sketch'), ('canvas', 'Canvas'), ('wallart', 'Wall Art'), ('digital', 'Digital'), ('photography', 'Photography')], default='sketch', max_length=20)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('complete', 'Complete')], default='open', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('artwork', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='artwork.artwork')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:31
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Title outweighs description; the trigger keeps the column current on every INSERT and
+# on any UPDATE that touches either column (including queryset.update() calls).
+SEARCH_SQL = """
+CREATE FUNCTION artwork_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER artwork_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON artwork_artwork
+    FOR EACH ROW EXECUTE FUNCTION artwork_search_vector_update();
+
+CREATE INDEX artwork_search_vector_gin ON artwork_artwork USING gin (search_vector);
+
+UPDATE artwork_artwork SET title = title;
+"""
+
+DROP_SEARCH_SQL = """
+DROP INDEX IF EXISTS artwork_search_vector_gin;
+DROP TRIGGER IF EXISTS artwork_search_vector_trigger ON artwork_artwork;
+DROP FUNCTION IF EXISTS artwork_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    # SQLite (tests) has no tsvector support; ArtworkSearchFilter falls back to icontains there
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_SQL)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_SEARCH_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0008_uploadsession'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0009_artwork_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['-submission_date', '-id'], name='artwork_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(condition=models.Q(('approval_status', 'approved')), fields=['-submission_date', '-id'], name='artwork_approved_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(condition=models.Q(('approval_status', 'pending')), fields=['submission_date'], name='artwork_pending_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['artist', 'approval_status'], name='artwork_artist_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(fields=['category', 'approval_status'], name='artwork_category_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['user', '-created_at'], name='like_user_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from artwork.stats import rebuild
+
+
+def backfill_category_stats(apps, schema_editor):
+    rebuild(apps.get_model('artwork', 'Artwork'), apps.get_model('artwork', 'ArtworkCategoryStat'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0010_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtworkCategoryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('sketch', 'Sketch'), ('canvas', 'Canvas'), ('wallart', 'Wall Art'), ('digital', 'Digital'), ('photography', 'Photography')], max_length=20)),
+                ('approval_status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('artist', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('category', 'approval_status', 'artist'), name='artwork_stat_artist_uniq'), models.UniqueConstraint(condition=models.Q(('artist__isnull', True)), fields=('category', 'approval_status'), name='artwork_stat_total_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_category_stats, migrations.RunPython.noop),
+    ]
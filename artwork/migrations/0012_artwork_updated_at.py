@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0011_artworkcategorystat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
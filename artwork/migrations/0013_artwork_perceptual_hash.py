@@ -0,0 +1,24 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0012_artwork_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='perceptual_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='possible_duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='artwork.artwork'),
+        ),
+    ]
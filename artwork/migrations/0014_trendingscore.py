@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0013_artwork_perceptual_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('artwork', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='artwork.artwork')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score'], name='trending_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0014_trendingscore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artwork',
+            name='dominant_color',
+            field=models.CharField(blank=True, default='', editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='artwork',
+            name='placeholder',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0015_artwork_image_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarArtwork',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('artwork', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_artworks', to='artwork.artwork')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_from', to='artwork.artwork')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['artwork', '-score'], name='similar_artwork_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('artwork', 'similar'), name='similar_artwork_pair_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artwork', '0016_similar_artworks'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artwork',
+            index=models.Index(condition=models.Q(('perceptual_hash', ''), _negated=True), fields=['updated_at'], name='artwork_hashed_updated_idx'),
+        ),
+    ]
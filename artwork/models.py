@@ -1,5 +1,17 @@
-from django.db import models
+import uuid
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from users.models import CustomUser
+from imaging.storage import get_media_storage
+
+
+class ArtworkQuerySet(models.QuerySet):
+    def for_listing(self):
+        # Fetch everything ArtworkSerializer reads in the same query (no per-row lookups);
+        # the tsvector is only needed inside WHERE/ORDER BY, never in Python
+        return self.select_related("artist").defer("search_vector")
+
 
 class Artwork(models.Model):
     
@@ -19,15 +31,55 @@ class Artwork(models.Model):
         ('rejected', 'Rejected'),
     ]
 
+
+    PROCESSING_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     title = models.CharField(max_length=100)
     description = models.TextField()
-    image = models.ImageField(upload_to='artworks/')
+    image = models.ImageField(upload_to='artworks/', storage=get_media_storage)
     artist = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='artworks')
     submission_date = models.DateTimeField(auto_now_add=True)
     approval_status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     feedback = models.TextField(blank=True, null=True)  # ✅ New field for rejection feedback
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='sketch')
+    likes_count = models.PositiveIntegerField(default=0)  # Denormalized, kept in sync by like/unlike
+    processing_status = models.CharField(max_length=10, choices=PROCESSING_CHOICES, default='pending')  # Set by the image worker
+    search_vector = SearchVectorField(null=True, editable=False)  # Maintained by a PostgreSQL trigger (see migration 0009)
+    updated_at = models.DateTimeField(auto_now=True)  # ETag/Last-Modified source; queryset.update() callers set it too
+    perceptual_hash = models.CharField(max_length=16, blank=True, default='', editable=False)  # 64-bit dHash, hex
+    possible_duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')  # Set by the image worker once the upload is hashed
+    # Filled by the image worker so clients can reserve space and show a preview before the image loads
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    dominant_color = models.CharField(max_length=7, blank=True, default='', editable=False)  # "#rrggbb"
+    placeholder = models.TextField(blank=True, default='', editable=False)  # Tiny WebP data URI (LQIP)
+
+    objects = ArtworkQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Gallery/keyset listing order
+            models.Index(fields=['-submission_date', '-id'], name='artwork_recent_idx'),
+            # Featured feed and the public gallery only ever read approved rows
+            models.Index(fields=['-submission_date', '-id'], condition=models.Q(approval_status='approved'), name='artwork_approved_recent_idx'),
+            # Moderation queue (oldest pending first)
+            models.Index(fields=['submission_date'], condition=models.Q(approval_status='pending'), name='artwork_pending_queue_idx'),
+            # MemberStatsView: per-artist totals by status
+            models.Index(fields=['artist', 'approval_status'], name='artwork_artist_status_idx'),
+            # category_analytics: GROUP BY category with per-status counts
+            models.Index(fields=['category', 'approval_status'], name='artwork_category_status_idx'),
+            # DuplicateIndex.refresh(): hashed rows changed since the last top-up
+            models.Index(fields=['updated_at'], condition=~models.Q(perceptual_hash=''), name='artwork_hashed_updated_idx'),
+        ]
 
+    def save(self, *args, **kwargs):
+        # The category rollup is adjusted from post_save; keep both writes in one transaction
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -41,6 +93,116 @@ class Like(models.Model):
 
     class Meta:
         unique_together = ('user', 'artwork')  # Ensure users can only like an artwork once
+        indexes = [
+            # A user's likes, most recent first
+            models.Index(fields=['user', '-created_at'], name='like_user_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} liked {self.artwork.title}"
+
+
+
+class ArtworkCategoryStat(models.Model):
+    """Rollup of artwork counts per (category, approval status, artist).
+
+    Rows with artist=NULL hold the club-wide totals, so both the admin analytics and a
+    member's breakdown read at most categories x statuses rows. Maintained by the
+    artwork signals (see artwork/stats.py); `rebuild_category_stats` repairs drift.
+    """
+    category = models.CharField(max_length=20, choices=Artwork.CATEGORY_CHOICES)
+    approval_status = models.CharField(max_length=10, choices=Artwork.STATUS_CHOICES)
+    artist = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'approval_status', 'artist'], name='artwork_stat_artist_uniq'),
+            models.UniqueConstraint(
+                fields=['category', 'approval_status'],
+                condition=models.Q(artist__isnull=True),
+                name='artwork_stat_total_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        owner = self.artist_id or "all"
+        return f"{self.category}/{self.approval_status} ({owner}): {self.count}"
+
+
+
+class TrendingScore(models.Model):
+    """Precomputed time-decayed like velocity per approved artwork (see artwork/trending.py).
+
+    Rebuilt wholesale by the `compute_trending` command; requests only read it.
+    """
+    artwork = models.OneToOneField(Artwork, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score'], name='trending_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.artwork_id}: {self.score:.3f}"
+
+
+
+class SimilarArtwork(models.Model):
+    """Top-K co-liked neighbours of an artwork with their cosine similarity (see artwork/similarity.py).
+
+    Rebuilt wholesale by the `compute_similar_artworks` command; requests only read it.
+    """
+    artwork = models.ForeignKey(Artwork, on_delete=models.CASCADE, related_name='similar_artworks')
+    similar = models.ForeignKey(Artwork, on_delete=models.CASCADE, related_name='similar_from')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['artwork', 'similar'], name='similar_artwork_pair_uniq'),
+        ]
+        indexes = [
+            # The `similar` action reads one artwork's neighbours, best first
+            models.Index(fields=['artwork', '-score'], name='similar_artwork_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.artwork_id} ~ {self.similar_id}: {self.score:.3f}"
+
+
+
+class UploadSession(models.Model):
+    """A resumable, chunked artwork upload; the Artwork row is created on finalize."""
+
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    received_chunks = models.JSONField(default=list)  # Indexes of the chunks stored so far
+    title = models.CharField(max_length=100)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Artwork.CATEGORY_CHOICES, default='sketch')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    artwork = models.ForeignKey(Artwork, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def chunk_count(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def expected_chunk_length(self, index):
+        if index == self.chunk_count - 1:
+            return self.total_size - index * self.chunk_size
+        return self.chunk_size
 
     def __str__(self):
-        return f"{self.user.username} liked {self.artwork.title}"
\ No newline at end of file
+        return f"{self.filename} ({len(self.received_chunks)}/{self.chunk_count} chunks)"
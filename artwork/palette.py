@@ -0,0 +1,137 @@
+"""Colour search over artwork histograms.
+
+Every artwork's COLOR_BINS ** 3 colour histogram (imaging.processing.color_histogram) is a
+row of one float32 .npy file, memory-mapped and addressed directly by artwork id (rows of
+missing ids stay zero). A ?color= query turns the colour into a weight per histogram cell
+and scores every artwork with a single matrix-vector product: ~25 MB and a few ms for
+100k artworks, with no database work until the winning ids are fetched.
+
+Writers (the image worker and backfill_image_metadata) update rows in place; growing the
+file writes a larger copy and swaps it in with os.replace, and readers notice the new
+inode on their next query. Deleting an artwork zeroes its row once the deletion commits,
+so deleted work never takes one of the ARTWORK_COLOR_SEARCH_LIMIT candidate slots.
+"""
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from django.conf import settings
+
+from imaging.processing import COLOR_BINS
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialised across processes
+    fcntl = None
+
+HEX_COLOR = re.compile(r"^#?([0-9a-fA-F]{6})$")
+COLOR_SPREAD = 48.0  # How far (in RGB units) a cell's colour may be from the query and still count
+MIN_SCORE = 0.05  # Roughly: at least 5% of the image close to the colour
+CELL_CENTERS = (
+    np.stack(np.meshgrid(*[np.arange(COLOR_BINS)] * 3, indexing="ij"), axis=-1).reshape(-1, 3) + 0.5
+) * (256 // COLOR_BINS)
+
+
+def parse_color(value):
+    """'#rrggbb' (or 'rrggbb') -> (r, g, b); ValueError for anything else."""
+    match = HEX_COLOR.match(value.strip())
+    if match is None:
+        raise ValueError(f"{value!r} is not a #rrggbb colour")
+    digits = match.group(1)
+    return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def color_weights(rgb):
+    """Per-cell weight for a query colour: 1 at the colour, falling off with RGB distance."""
+    distance2 = ((CELL_CENTERS - np.asarray(rgb, dtype=np.float64)) ** 2).sum(axis=1)
+    return np.exp(-distance2 / (2 * COLOR_SPREAD ** 2)).astype(np.float32)
+
+
+class ColorIndex:
+    """Memory-mapped (artwork id -> colour histogram) matrix; see the module docstring."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.matrix = None
+        self.stamp = None
+
+    @property
+    def path(self):
+        return settings.ARTWORK_COLOR_INDEX_PATH
+
+    def load(self):
+        """The current read-only matrix, reopened if the file was replaced; None if it doesn't exist yet."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        stamp = (self.path, stat.st_dev, stat.st_ino)
+        with self.lock:
+            if stamp != self.stamp:
+                self.matrix = np.load(self.path, mmap_mode="r")
+                self.stamp = stamp
+            return self.matrix
+
+    def search(self, rgb, limit, min_score=MIN_SCORE):
+        """[(artwork id, score)] of the `limit` artworks whose pixels sit closest to `rgb`, best first."""
+        matrix = self.load()
+        if matrix is None or limit <= 0:
+            return []
+        scores = matrix @ color_weights(rgb)
+        candidates = np.flatnonzero(scores >= min_score)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(pk), float(scores[pk])) for pk in candidates]
+
+    def store(self, ids, histogram):
+        """Write one histogram to the rows of `ids` (artworks sharing the same file)."""
+        ids = [int(pk) for pk in ids]
+        if not ids:
+            return
+        with self._write_lock():
+            matrix = self._writable(max(ids) + 1)
+            matrix[ids] = np.asarray(histogram, dtype=np.float32)
+            matrix.flush()
+
+    def clear(self, ids):
+        """Zero the rows of `ids` (deleted artworks); ids past the end of the file have none."""
+        ids = [int(pk) for pk in ids]
+        if not ids or not os.path.exists(self.path):
+            return
+        with self._write_lock():
+            matrix = np.load(self.path, mmap_mode="r+")
+            ids = [pk for pk in ids if pk < len(matrix)]
+            if ids:
+                matrix[ids] = 0
+                matrix.flush()
+
+    @contextmanager
+    def _write_lock(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _writable(self, rows):
+        """An r+ memmap with at least `rows` rows, growing (copy + os.replace) when needed."""
+        width = COLOR_BINS ** 3
+        current = np.load(self.path, mmap_mode="r+") if os.path.exists(self.path) else None
+        if current is not None and len(current) >= rows:
+            return current
+        capacity = max(rows, 1024, 2 * len(current) if current is not None else 0)
+        staging = f"{self.path}.grow"
+        grown = np.lib.format.open_memmap(staging, mode="w+", dtype=np.float32, shape=(capacity, width))
+        if current is not None:
+            grown[:len(current)] = current
+        grown.flush()
+        del current, grown
+        os.replace(staging, self.path)
+        return np.load(self.path, mmap_mode="r+")
+
+
+color_index = ColorIndex()
+
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Value, When
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from .palette import color_index, parse_color
+
+
+class ArtworkSearchFilter(filters.SearchFilter):
+    """?search= backed by the artwork tsvector column on PostgreSQL.
+
+    Matches use the GIN index and are ranked with ts_rank (title weighted over description).
+    On other databases (SQLite in tests) it behaves exactly like DRF's SearchFilter.
+    """
+    search_config = 'english'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(terms, search_type='websearch', config=self.search_config)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', '-submission_date', '-id')
+        )
+
+
+class ArtworkColorFilter(filters.BaseFilterBackend):
+    """?color=#rrggbb: the ARTWORK_COLOR_SEARCH_LIMIT artworks closest to that colour, best match first.
+
+    Other filters narrow that candidate set further.
+    """
+    color_param = "color"
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.color_param, "").strip()
+        if not value:
+            return queryset
+        try:
+            rgb = parse_color(value)
+        except ValueError as exc:
+            raise ValidationError({self.color_param: [str(exc)]})
+
+        matches = color_index.search(rgb, settings.ARTWORK_COLOR_SEARCH_LIMIT)
+        if not matches:
+            return queryset.none()
+        rank = Case(
+            *[When(pk=pk, then=Value(position)) for position, (pk, _) in enumerate(matches)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=[pk for pk, _ in matches]).annotate(color_rank=rank).order_by("color_rank")
@@ -1,28 +1,125 @@
+import os
+from django.conf import settings
+from django.core.files import File
+from django.core.validators import validate_image_file_extension
 from rest_framework import serializers
-from .models import Artwork
+from .models import Artwork, UploadSession
+from users.caching import user_cache
+from users.mixins import SparseFieldsetSerializerMixin
 from users.models import CustomUser
+from users.serializers import UserSummarySerializer
+from users.values import ValuesSerializer
+from imaging.derivatives import rendition_urls
+from imaging.serializers import RenditionsField
 
-class ArtworkSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField(use_url=True) 
+class ArtworkSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # Plain FileField: decoding/validating the pixels happens in the image worker, not the request
+    image = serializers.FileField(use_url=True, validators=[validate_image_file_extension])
+    image_renditions = RenditionsField(source="image")
     artist_name = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()  # Add likes count
+    liked_by_me = serializers.SerializerMethodField()
+
+    # ?expand=artist nests the artist instead of returning the id
+    expandable_fields = {'artist': (UserSummarySerializer, {})}
+    field_sources = {'artist_name': ['artist'], 'image_renditions': ['image', 'processing_status'], 'liked_by_me': []}
 
     
     class Meta:
         model = Artwork
-        fields = ['id', 'title', 'description', 'image', 'artist', 'artist_name', 'feedback', 'approval_status', 'submission_date', 'category', "likes_count"]  # ✅ Include 'id' and 'approval_status'
-        read_only_fields = ['approval_status', 'feedback', 'artist', 'submission_date']
+        fields = ['id', 'title', 'description', 'image', 'image_renditions', 'artist', 'artist_name', 'feedback', 'approval_status', 'submission_date', 'category', "likes_count", 'processing_status', 'possible_duplicate_of', 'liked_by_me', 'image_width', 'image_height', 'dominant_color', 'placeholder']  # ✅ Include 'id' and 'approval_status'
+        read_only_fields = ['approval_status', 'feedback', 'artist', 'submission_date', 'likes_count', 'processing_status', 'possible_duplicate_of']
         
         
     def get_artist_name(self, obj):
         # This method will return the artist's first and last name
-        return f"{obj.artist.first_name} {obj.artist.last_name}"    
+        # (joined in by ArtworkQuerySet.for_listing; otherwise read through the user cache)
+        artist = obj.artist if Artwork.artist.is_cached(obj) else user_cache.get(obj.artist_id)
+        return f"{artist.first_name} {artist.last_name}"    
         
         
+    def get_liked_by_me(self, obj):
+        # Filled per page by the view (context["liked_ids"]); null where the view doesn't look it up
+        liked_ids = self.context.get('liked_ids')
+        if liked_ids is None:
+            return None
+        return obj.pk in liked_ids
+
+
     def create(self, validated_data):
         request = self.context.get('request')  # Get the request from the context
         validated_data['artist'] = request.user  # Assign the logged-in user
         return super().create(validated_data)
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()  # Return the number of likes
\ No newline at end of file
+
+class ArtworkValuesSerializer(ValuesSerializer):
+    """ArtworkSerializer's output built from values() rows, for the list endpoint."""
+    fields = ArtworkSerializer.Meta.fields
+    sources = {
+        'artist_name': ['artist__first_name', 'artist__last_name'],
+        'image_renditions': ['image', 'processing_status'],
+        'liked_by_me': ['id'],
+    }
+    datetime_fields = ('submission_date',)
+
+    def get_image(self, row):
+        return self.file_url(Artwork._meta.get_field('image').storage, row['image'])
+
+    def get_image_renditions(self, row):
+        if row['processing_status'] != 'ready':  # Not generated yet (or never will be)
+            return None
+        urls = rendition_urls(row['image'])
+        if urls is None:
+            return None
+        return {rendition: self.absolute_url(url) for rendition, url in urls.items()}
+
+    def get_artist_name(self, row):
+        return f"{row['artist__first_name']} {row['artist__last_name']}"
+
+    def get_liked_by_me(self, row):
+        liked_ids = self.context.get('liked_ids')
+        if liked_ids is None:
+            return None
+        return row['id'] in liked_ids
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_count = serializers.IntegerField(read_only=True)
+    chunk_size = serializers.IntegerField(required=False, min_value=64 * 1024)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'total_size', 'chunk_size', 'chunk_count', 'received_chunks', 'title', 'description', 'category', 'status', 'artwork', 'created_at']
+        read_only_fields = ['received_chunks', 'status', 'artwork', 'created_at']
+
+    def validate_filename(self, value):
+        validate_image_file_extension(File(None, name=value))
+        return os.path.basename(value)
+
+    def validate_total_size(self, value):
+        if value < 1 or value > settings.ARTWORK_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Uploads must be between 1 byte and {settings.ARTWORK_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_chunk_size(self, value):
+        return min(value, settings.ARTWORK_UPLOAD_CHUNK_SIZE)
+
+
+class ModerationDecisionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    decision = serializers.ChoiceField(choices=['approve', 'reject'])
+    feedback = serializers.CharField(required=False, allow_blank=True, default="")
+
+    def validate(self, attrs):
+        if attrs['decision'] == 'reject' and not attrs['feedback'].strip():
+            raise serializers.ValidationError({"feedback": "Feedback is required when rejecting an artwork."})
+        return attrs
+
+
+class BulkModerationSerializer(serializers.Serializer):
+    decisions = ModerationDecisionSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_decisions(self, value):
+        ids = [item['id'] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each artwork may appear only once.")
+        return value
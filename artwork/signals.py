@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from imaging.jobs import image_metadata_stored
+
+from . import stats
+from .cache import invalidate_featured
+from .duplicates import nearest_duplicate, newer_duplicates
+from .models import Artwork
+from .palette import color_index
+
+
+@receiver(post_save, sender=Artwork, dispatch_uid="artwork.featured.save")
+@receiver(post_delete, sender=Artwork, dispatch_uid="artwork.featured.delete")
+def artwork_changed(sender, instance, **kwargs):
+    # Covers admin edits, deletions and uploads. Like counters change via queryset.update(),
+    # which sends no signal; the like views call invalidate_featured_likes() instead.
+    invalidate_featured()
+
+
+@receiver(post_init, sender=Artwork, dispatch_uid="artwork.stats.remember")
+def remember_rollup_key(sender, instance, **kwargs):
+    instance._rollup_key = stats.rollup_key(instance)
+
+
+@receiver(pre_save, sender=Artwork, dispatch_uid="artwork.stats.stored")
+def remember_stored_rollup_key(sender, instance, **kwargs):
+    # Loaded with category/status deferred, so post_init couldn't tell the row's bucket
+    if not instance._state.adding and instance.pk is not None and getattr(instance, "_rollup_key", None) is None:
+        instance._rollup_key = stats.stored_rollup_key(instance.pk)
+
+
+@receiver(post_save, sender=Artwork, dispatch_uid="artwork.stats.save")
+def update_rollup_on_save(sender, instance, created=False, **kwargs):
+    # Artwork.save() wraps this in the same transaction as the row write
+    key = stats.rollup_key(instance)
+    if key is None and not created:
+        key = stats.stored_rollup_key(instance.pk)  # Fields still deferred kept their stored values
+    previous = getattr(instance, "_rollup_key", None)
+    if key is None:
+        return
+    if created:
+        stats.adjust(key, 1)
+    elif previous is not None and key != previous:
+        stats.adjust(previous, -1)
+        stats.adjust(key, 1)
+    instance._rollup_key = key
+
+
+@receiver(pre_delete, sender=Artwork, dispatch_uid="artwork.stats.stored_on_delete")
+def remember_rollup_key_on_delete(sender, instance, **kwargs):
+    if getattr(instance, "_rollup_key", None) is None:
+        instance._rollup_key = stats.stored_rollup_key(instance.pk)
+
+
+@receiver(post_delete, sender=Artwork, dispatch_uid="artwork.stats.delete")
+def update_rollup_on_delete(sender, instance, **kwargs):
+    # The deletion collector sends this inside its own transaction
+    key = getattr(instance, "_rollup_key", None) or stats.rollup_key(instance)
+    if key is not None:
+        stats.adjust(key, -1)
+
+
+@receiver(image_metadata_stored, sender=Artwork, dispatch_uid="artwork.palette.store")
+def store_color_histogram(sender, queryset, field_name, metadata, **kwargs):
+    # The image worker (or backfill_image_metadata) extracted a histogram for these rows' image
+    if field_name == "image" and metadata.get("color_histogram"):
+        color_index.store(queryset.values_list("pk", flat=True), metadata["color_histogram"])
+
+
+@receiver(post_delete, sender=Artwork, dispatch_uid="artwork.palette.clear")
+def clear_color_histogram(sender, instance, **kwargs):
+    # After commit, so a rolled-back deletion stays searchable (the collector clears pk first)
+    pk = instance.pk
+    transaction.on_commit(lambda: color_index.clear([pk]))
+
+
+@receiver(image_metadata_stored, sender=Artwork, dispatch_uid="artwork.duplicates.flag")
+def flag_possible_duplicate(sender, queryset, field_name, metadata, **kwargs):
+    # The worker stored the upload's perceptual hash; flag it against older artworks, and
+    # newer ones against it (jobs finish in any order, so theirs may have run first)
+    digest = metadata.get("perceptual_hash")
+    if field_name != "image" or not digest:
+        return
+    for pk, flagged in queryset.values_list("pk", "possible_duplicate_of"):
+        original = None if flagged is not None else nearest_duplicate(digest, before=pk)
+        if original is not None:
+            Artwork.objects.filter(pk=pk).update(possible_duplicate_of_id=original, updated_at=timezone.now())
+        copies = newer_duplicates(digest, after=pk)
+        if copies:
+            Artwork.objects.filter(pk__in=copies, possible_duplicate_of__isnull=True).update(
+                possible_duplicate_of_id=pk, updated_at=timezone.now()
+            )
@@ -0,0 +1,120 @@
+"""Item-to-item "people who liked this also liked" recommendations.
+
+The Like table is a sparse user x artwork matrix A. Co-like counts are C = A.T @ A, and
+the similarity of two artworks is the cosine C[i, j] / sqrt(n_i * n_j), where n_i is the
+number of likes on artwork i. C is never materialised: artworks are processed in blocks
+sized so that the (artwork, co-liked artwork) pairs expanded for one block stay under
+`max_pairs`. Only the top-K neighbours of each artwork are kept.
+
+Everything is done with NumPy index arithmetic on CSR/CSC-style arrays, so the only
+per-like Python work is reading the rows. Memory is about 50 bytes per like for the
+index arrays plus a few int64 arrays of `max_pairs` entries for the block in flight.
+"""
+from itertools import chain
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+LIKE_FETCH_SIZE = 20000
+
+
+def load_likes():
+    """(user ids, artwork ids) of every like on an approved artwork, as int64 arrays."""
+    from .models import Like
+
+    rows = (
+        Like.objects.filter(artwork__approval_status="approved")
+        .order_by()
+        .values_list("user_id", "artwork_id")
+        .iterator(chunk_size=LIKE_FETCH_SIZE)
+    )
+    pairs = np.fromiter(chain.from_iterable(rows), dtype=np.int64).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _compressed(rows, cols, size):
+    """CSR-style (indptr, indices) grouping `cols` by `rows` (both dense 0..size-1 indices)."""
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _expand(indptr, indices, groups):
+    """indices[indptr[g]:indptr[g + 1]] for every g in `groups`, concatenated, plus each run's length."""
+    lengths = indptr[groups + 1] - indptr[groups]
+    offsets = np.repeat(indptr[groups] - (np.cumsum(lengths) - lengths), lengths)
+    return indices[offsets + np.arange(lengths.sum())], lengths
+
+
+def _blocks(cost, max_pairs):
+    """Split 0..len(cost) into consecutive [start, stop) blocks whose summed cost stays under max_pairs."""
+    spent = np.cumsum(cost)
+    start = 0
+    while start < len(cost):
+        before = spent[start - 1] if start else 0
+        # A single artwork over budget still gets a block of its own
+        stop = max(int(np.searchsorted(spent, before + max_pairs, side="right")), start + 1)
+        yield start, stop
+        start = stop
+
+
+def similar_pairs(user_ids, artwork_ids, top_k, max_pairs=2_000_000, min_co_likes=1):
+    """Yield (artwork ids, similar artwork ids, scores) arrays, one block of artworks at a time.
+
+    Each artwork gets at most `top_k` neighbours, best first; pairs co-liked by fewer than
+    `min_co_likes` users are dropped.
+    """
+    if len(artwork_ids) == 0:
+        return
+    users, user_index = np.unique(user_ids, return_inverse=True)
+    items, item_index = np.unique(artwork_ids, return_inverse=True)
+    user_ptr, user_items = _compressed(user_index, item_index, len(users))
+    item_ptr, item_users = _compressed(item_index, user_index, len(items))
+    item_likes = np.diff(item_ptr)
+    user_likes = np.diff(user_ptr)
+
+    # Pairs expanded for artwork i = sum of its likers' like counts
+    cost = np.add.reduceat(user_likes[item_users], item_ptr[:-1])
+    for start, stop in _blocks(cost, max_pairs):
+        block = np.arange(start, stop)
+        likers, per_item = _expand(item_ptr, item_users, block)
+        targets, per_liker = _expand(user_ptr, user_items, likers)
+        sources = np.repeat(np.repeat(block, per_item), per_liker)
+
+        keep = sources != targets
+        keys, co_likes = np.unique((sources[keep] - start) * len(items) + targets[keep], return_counts=True)
+        keep = co_likes >= min_co_likes
+        keys, co_likes = keys[keep], co_likes[keep]
+        sources, targets = keys // len(items) + start, keys % len(items)
+        scores = co_likes / np.sqrt(item_likes[sources] * item_likes[targets])
+
+        # Best first within each source (ties to the lower id), then cut every run at top_k
+        order = np.lexsort((targets, -scores, sources))
+        sources, targets, scores = sources[order], targets[order], scores[order]
+        run_start = np.searchsorted(sources, sources, side="left")
+        keep = np.arange(len(sources)) - run_start < top_k
+        yield items[sources[keep]], items[targets[keep]], scores[keep]
+
+
+def compute_similar_artworks(top_k=None, max_pairs=2_000_000, min_co_likes=1):
+    """Replace the SimilarArtwork table from the current likes; returns the number of rows written."""
+    from .models import SimilarArtwork
+
+    top_k = top_k or settings.SIMILAR_ARTWORKS_TOP_K
+    user_ids, artwork_ids = load_likes()
+    written = 0
+    # Readers keep seeing the previous table until the rebuild commits
+    with transaction.atomic():
+        SimilarArtwork.objects.all().delete()
+        for sources, targets, scores in similar_pairs(user_ids, artwork_ids, top_k, max_pairs, min_co_likes):
+            SimilarArtwork.objects.bulk_create(
+                (
+                    SimilarArtwork(artwork_id=int(source), similar_id=int(target), score=float(score))
+                    for source, target, score in zip(sources, targets, scores)
+                ),
+                batch_size=2000,
+            )
+            written += len(sources)
+    return written
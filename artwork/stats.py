@@ -0,0 +1,76 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+STATUSES = ("approved", "pending", "rejected")
+
+
+def rollup_key(artwork):
+    """The rollup bucket an artwork counts towards, or None if a field is deferred."""
+    fields = artwork.__dict__
+    if "category" not in fields or "approval_status" not in fields or "artist_id" not in fields:
+        return None
+    return (artwork.category, artwork.approval_status, artwork.artist_id)
+
+
+def stored_rollup_key(pk):
+    """The bucket the database row currently counts towards (None if the row is gone)."""
+    from .models import Artwork
+
+    return Artwork._base_manager.filter(pk=pk).values_list("category", "approval_status", "artist_id").first()
+
+
+def adjust(key, delta):
+    """Add `delta` to the artist's bucket and to the club-wide (artist=NULL) bucket."""
+    from .models import ArtworkCategoryStat
+
+    category, approval_status, artist_id = key
+    for owner in (artist_id, None):
+        rows = ArtworkCategoryStat.objects.filter(category=category, approval_status=approval_status, artist_id=owner)
+        if delta < 0:
+            rows.filter(count__gte=-delta).update(count=F("count") + delta)
+        elif not rows.update(count=F("count") + delta):
+            try:
+                with transaction.atomic():
+                    ArtworkCategoryStat.objects.create(
+                        category=category, approval_status=approval_status, artist_id=owner, count=delta
+                    )
+            except IntegrityError:
+                # Another transaction created the bucket first
+                rows.update(count=F("count") + delta)
+
+
+def rebuild(Artwork, ArtworkCategoryStat):
+    """Recount every bucket from the artwork table. Takes the model classes so migrations can use it."""
+    per_artist = (
+        Artwork.objects.values("category", "approval_status", "artist_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    rows = []
+    totals = {}
+    for row in per_artist:
+        rows.append(ArtworkCategoryStat(
+            category=row["category"], approval_status=row["approval_status"], artist_id=row["artist_id"], count=row["total"]
+        ))
+        key = (row["category"], row["approval_status"])
+        totals[key] = totals.get(key, 0) + row["total"]
+    rows.extend(
+        ArtworkCategoryStat(category=category, approval_status=approval_status, artist_id=None, count=total)
+        for (category, approval_status), total in totals.items()
+    )
+    ArtworkCategoryStat.objects.all().delete()
+    ArtworkCategoryStat.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def category_counts(artist=None):
+    """{category: {"approved": n, "pending": n, "rejected": n, "total": n}} for one artist or the whole club."""
+    from .models import ArtworkCategoryStat
+
+    counts = {}
+    rows = ArtworkCategoryStat.objects.filter(artist=artist, count__gt=0).values_list("category", "approval_status", "count")
+    for category, approval_status, count in rows:
+        bucket = counts.setdefault(category, dict.fromkeys(STATUSES + ("total",), 0))
+        bucket[approval_status] += count
+        bucket["total"] += count
+    return counts
@@ -1,7 +1,30 @@
+import random
+from datetime import timedelta
+from io import BytesIO
+
 import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 from users.models import CustomUser
-from artwork.models import Artwork
+from PIL import Image, ImageDraw
+from artwork.cache import featured_timeout
+from artwork.duplicates import DuplicateIndex, duplicate_index
+from artwork.models import Artwork, ArtworkCategoryStat, Like, TrendingScore
+from artwork.stats import category_counts
+from notifications.models import Notification
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # The locmem cache outlives each test's rolled-back transaction
+    cache.clear()
+    yield
+    cache.clear()
 
 @pytest.mark.django_db
 def test_create_artwork():
@@ -22,3 +45,884 @@ def test_create_artwork():
     assert response.status_code == 201
     assert Artwork.objects.count() == 1
     assert Artwork.objects.first().title == "Test Artwork"
+
+
+def _make_artworks(count, artist, liker):
+    for i in range(count):
+        artwork = Artwork.objects.create(
+            title=f"Artwork {i}",
+            description="Listing query test",
+            image="artworks/test.jpg",
+            artist=artist,
+            approval_status="approved",
+        )
+        Like.objects.create(user=liker, artwork=artwork)
+        Artwork.objects.filter(pk=artwork.pk).update(likes_count=1)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [2, 20])
+def test_artwork_list_query_count_is_fixed(count, django_assert_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    _make_artworks(count, artist, liker)
+
+    # COUNT/MAX for the ETag, one COUNT for the paginator and one SELECT for the page, whatever the page size
+    with django_assert_num_queries(3):
+        response = client.get("/api/artwork/", {"page_size": count})
+
+    assert response.status_code == 200
+    assert len(response.data["results"]) == count
+    assert all(item["likes_count"] == 1 for item in response.data["results"])
+    assert response.data["results"][0]["artist_name"] == f"{artist.first_name} {artist.last_name}"
+
+
+@pytest.mark.django_db
+def test_like_and_unlike_keep_counter_in_sync():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    artwork = Artwork.objects.create(title="Liked", description="x", image="artworks/test.jpg", artist=artist)
+    client.force_authenticate(user=liker)
+
+    assert client.post(f"/api/artwork/{artwork.id}/like/").status_code == 201
+    assert client.post(f"/api/artwork/{artwork.id}/like/").status_code == 400
+    artwork.refresh_from_db()
+    assert artwork.likes_count == 1
+    assert client.get(f"/api/artwork/{artwork.id}/likes/").data == {"likes": 1}
+
+    assert client.delete(f"/api/artwork/{artwork.id}/unlike/").status_code == 200
+    assert client.delete(f"/api/artwork/{artwork.id}/unlike/").status_code == 404
+    artwork.refresh_from_db()
+    assert artwork.likes_count == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_like_counts_fixes_drift():
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    _make_artworks(3, artist, liker)
+    Artwork.objects.update(likes_count=7)
+
+    call_command("reconcile_like_counts", batch_size=2)
+
+    assert set(Artwork.objects.values_list("likes_count", flat=True)) == {1}
+
+
+@pytest.mark.django_db
+def test_chunked_upload_can_resume_and_finalize(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.ARTWORK_UPLOAD_TEMP_DIR = str(tmp_path / "uploads")
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+    data = bytes(range(256)) * 1000  # 256,000 bytes -> 4 chunks of 64 KiB
+
+    response = client.post("/api/artwork/uploads/", {
+        "filename": "big.png", "total_size": len(data), "chunk_size": 65536,
+        "title": "Chunked", "description": "Resumable", "category": "digital",
+    }, format="json")
+    assert response.status_code == 201
+    session_id, chunk_size = response.data["id"], response.data["chunk_size"]
+    assert response.data["chunk_count"] == 4
+
+    def put(index):
+        chunk = data[index * chunk_size:(index + 1) * chunk_size]
+        return client.put(f"/api/artwork/uploads/{session_id}/chunks/{index}/", chunk, content_type="application/octet-stream")
+
+    # Chunks may arrive out of order; finalize refuses until every one is present
+    assert put(3).status_code == 200
+    assert put(0).status_code == 200
+    response = client.post(f"/api/artwork/uploads/{session_id}/finalize/")
+    assert response.status_code == 400 and response.data["missing_chunks"] == [1, 2]
+
+    assert client.get(f"/api/artwork/uploads/{session_id}/").data["received_chunks"] == [0, 3]
+    assert put(1).status_code == 200
+    assert put(2).status_code == 200
+
+    response = client.post(f"/api/artwork/uploads/{session_id}/finalize/")
+    assert response.status_code == 201
+    artwork = Artwork.objects.get(pk=response.data["id"])
+    assert artwork.title == "Chunked" and artwork.artist == artist
+    with artwork.image.open("rb") as fh:
+        assert fh.read() == data
+    assert not list((tmp_path / "uploads").iterdir())
+
+    # Finalizing again is idempotent, until the artwork is deleted
+    assert client.post(f"/api/artwork/uploads/{session_id}/finalize/").data["id"] == artwork.pk
+    artwork.delete()
+    assert client.post(f"/api/artwork/uploads/{session_id}/finalize/").status_code == 410
+
+
+@pytest.mark.django_db
+def test_chunked_upload_rejects_short_chunk(settings, tmp_path):
+    settings.ARTWORK_UPLOAD_TEMP_DIR = str(tmp_path)
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+    session_id = client.post("/api/artwork/uploads/", {
+        "filename": "big.jpg", "total_size": 100000, "title": "Short", "description": "x",
+    }, format="json").data["id"]
+
+    response = client.put(f"/api/artwork/uploads/{session_id}/chunks/0/", b"x" * 10, content_type="application/octet-stream")
+
+    assert response.status_code == 400
+    assert client.get(f"/api/artwork/uploads/{session_id}/").data["received_chunks"] == []
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_forward_and_back_without_counting(django_assert_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    _make_artworks(25, artist, artist)
+    Artwork.objects.filter(pk__in=Artwork.objects.order_by("pk").values("pk")[:3]).update(approval_status="pending")
+    # Several rows share a timestamp, so the id tie-breaker matters
+    stamp = Artwork.objects.order_by("pk").first().submission_date
+    Artwork.objects.filter(pk__in=Artwork.objects.order_by("pk").values("pk")[5:12]).update(submission_date=stamp)
+    expected = list(
+        Artwork.objects.filter(approval_status="approved").order_by("-submission_date", "-id").values_list("id", flat=True)
+    )
+
+    with django_assert_num_queries(1):
+        response = client.get("/api/artwork/", {"pagination": "cursor", "approval_status": "approved", "page_size": 10})
+    pages = [response.data]
+    while pages[-1]["next"]:
+        pages.append(client.get(pages[-1]["next"]).data)
+
+    assert [item["id"] for page in pages for item in page["results"]] == expected
+    assert [len(page["results"]) for page in pages] == [10, 10, 2]
+    assert "total_items" not in pages[0] and pages[0]["previous"] is None
+
+    back = client.get(pages[2]["previous"]).data
+    assert [item["id"] for item in back["results"]] == expected[10:20]
+    back = client.get(back["previous"]).data
+    assert [item["id"] for item in back["results"]] == expected[:10]
+    assert back["previous"] is None
+
+    counted = client.get("/api/artwork/", {"pagination": "cursor", "approval_status": "approved", "with_count": "true"})
+    assert counted.data["total_items"] == 22
+    assert client.get("/api/artwork/", {"cursor": "garbage"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_cursor_positions_are_validated():
+    import base64
+    import json
+
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    _make_artworks(3, artist, artist)
+
+    def cursor(position):
+        return base64.urlsafe_b64encode(json.dumps({"r": 0, "p": position}).encode()).decode()
+
+    for position in (["not-a-date", 1], ["2024-01-01T00:00:00Z", "x"], [{"a": 1}, 1], [None, 1]):
+        assert client.get("/api/artwork/", {"cursor": cursor(position)}).status_code == 404
+    assert client.get("/api/artwork/", {"cursor": cursor(["2999-01-01T00:00:00Z", 10 ** 9])}).status_code == 200
+
+    # Annotated ordering fields (the like time) are converted too
+    client.force_authenticate(user=artist)
+    assert client.get("/api/artworks/liked/", {"cursor": cursor(["yesterday", 1])}).status_code == 404
+    assert client.get("/api/artworks/liked/", {"cursor": cursor(["2024-01-01T00:00:00Z", 1])}).status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_combines_with_filters_on_sqlite_fallback():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    Artwork.objects.create(title="Sunset over the lake", description="Oil", image="artworks/a.jpg", artist=artist, approval_status="approved")
+    Artwork.objects.create(title="Portrait", description="Painted at sunset", image="artworks/b.jpg", artist=artist, approval_status="approved")
+    Artwork.objects.create(title="Sunset sketch", description="Pencil", image="artworks/c.jpg", artist=artist, approval_status="pending")
+
+    response = client.get("/api/artwork/", {"search": "sunset", "approval_status": "approved"})
+
+    assert response.status_code == 200
+    assert {item["title"] for item in response.data["results"]} == {"Sunset over the lake", "Portrait"}
+
+
+@pytest.mark.django_db
+def test_featured_feed_is_cached_until_moderation(settings, django_assert_num_queries, django_capture_on_commit_callbacks):
+    client = APIClient()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin", is_staff=True)
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    with django_capture_on_commit_callbacks(execute=True):
+        Artwork.objects.create(title="Shown", image="artworks/a.jpg", artist=artist, approval_status="approved")
+        pending = Artwork.objects.create(title="Queued", image="artworks/b.jpg", artist=artist, approval_status="pending")
+
+    first = client.get("/api/featured-artworks/")
+    with django_assert_num_queries(0):
+        second = client.get("/api/featured-artworks/")
+    assert second.data == first.data
+    assert [item["title"] for item in first.data["results"]] == ["Shown"]
+
+    client.force_authenticate(user=admin)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert client.patch(f"/api/artwork/{pending.id}/approve/").status_code == 200
+    client.force_authenticate(user=None)
+
+    refreshed = client.get("/api/featured-artworks/")
+    assert [item["title"] for item in refreshed.data["results"]] == ["Queued", "Shown"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        pending.delete()
+    assert [item["title"] for item in client.get("/api/featured-artworks/").data["results"]] == ["Shown"]
+
+    # Likes on a featured artwork retire the feed; likes elsewhere leave it cached
+    shown = Artwork.objects.get(title="Shown")
+    hidden = Artwork.objects.create(title="Hidden", image="artworks/c.jpg", artist=artist, approval_status="pending")
+    client.get("/api/featured-artworks/")
+    client.force_authenticate(user=admin)
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(f"/api/artwork/{hidden.id}/like/")
+    client.force_authenticate(user=None)
+    with django_assert_num_queries(0):
+        client.get("/api/featured-artworks/")
+
+    client.force_authenticate(user=admin)
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(f"/api/artwork/{shown.id}/like/")
+    client.force_authenticate(user=None)
+    assert client.get("/api/featured-artworks/").data["results"][0]["likes_count"] == 1
+
+    # Other workers never see a per-process version bump; their copies only live briefly
+    assert featured_timeout() == settings.FEATURED_ARTWORKS_LOCAL_CACHE_TIMEOUT
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    assert featured_timeout() == settings.FEATURED_ARTWORKS_CACHE_TIMEOUT
+
+
+@pytest.mark.django_db
+def test_category_rollup_tracks_creates_moderation_and_deletes(django_assert_num_queries):
+    client = APIClient()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin")
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123", role="member")
+    other = CustomUser.objects.create_user(username="other", email="other@example.com", password="password123")
+    sketch = Artwork.objects.create(title="A", image="artworks/a.jpg", artist=artist, category="sketch")
+    Artwork.objects.create(title="B", image="artworks/b.jpg", artist=artist, category="digital", approval_status="approved")
+    doomed = Artwork.objects.create(title="C", image="artworks/c.jpg", artist=other, category="sketch")
+
+    client.force_authenticate(user=admin)
+    assert client.patch(f"/api/artwork/{sketch.id}/approve/").status_code == 200
+    doomed.delete()
+
+    with django_assert_num_queries(1):
+        response = client.get("/api/artwork/category_analytics/")
+    assert response.data == [
+        {"category": "digital", "approved": 1, "pending": 0, "rejected": 0, "total": 1},
+        {"category": "sketch", "approved": 1, "pending": 0, "rejected": 0, "total": 1},
+    ]
+
+    client.force_authenticate(user=artist)
+    stats = client.get("/api/users/member-stats/").data
+    assert stats["total_artworks"] == 2
+    assert stats["approved_artworks"] == 2
+    assert stats["category_distribution"] == [{"category": "digital", "count": 1}, {"category": "sketch", "count": 1}]
+
+
+@pytest.mark.django_db
+def test_category_rollup_follows_saves_and_deletes_of_deferred_instances():
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    moved = Artwork.objects.create(title="A", image="artworks/a.jpg", artist=artist, category="sketch")
+    doomed = Artwork.objects.create(title="B", image="artworks/b.jpg", artist=artist, category="sketch")
+
+    artwork = Artwork.objects.only("pk", "title").get(pk=moved.pk)
+    artwork.category = "canvas"
+    artwork.save()
+    renamed = Artwork.objects.only("pk", "title").get(pk=moved.pk)
+    renamed.title = "A2"
+    renamed.save()
+    Artwork.objects.only("pk").get(pk=doomed.pk).delete()
+
+    assert category_counts()["canvas"]["pending"] == 1
+    assert category_counts().get("sketch", {}).get("total", 0) == 0
+    counts = set(ArtworkCategoryStat.objects.filter(count__gt=0).values_list("category", "approval_status", "artist", "count"))
+    assert counts == {("canvas", "pending", None, 1), ("canvas", "pending", artist.id, 1)}
+
+
+@pytest.mark.django_db
+def test_rebuild_category_stats_repairs_drift():
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    Artwork.objects.create(title="A", image="artworks/a.jpg", artist=artist, category="canvas")
+    Artwork.objects.create(title="B", image="artworks/b.jpg", artist=artist, category="canvas")
+    expected = set(ArtworkCategoryStat.objects.values_list("category", "approval_status", "artist", "count"))
+
+    # update() bypasses the signals, so the rollup drifts until it is rebuilt
+    Artwork.objects.update(approval_status="rejected")
+    ArtworkCategoryStat.objects.filter(artist__isnull=True).update(count=7)
+    call_command("rebuild_category_stats")
+
+    rebuilt = set(ArtworkCategoryStat.objects.values_list("category", "approval_status", "artist", "count"))
+    assert expected == {("canvas", "pending", None, 2), ("canvas", "pending", artist.id, 2)}
+    assert rebuilt == {("canvas", "rejected", None, 2), ("canvas", "rejected", artist.id, 2)}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [3, 30])
+def test_bulk_moderate_uses_fixed_number_of_queries(count, django_assert_num_queries):
+    client = APIClient()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin")
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    artworks = [
+        Artwork.objects.create(title=f"Art {i}", image="artworks/a.jpg", artist=artist, category="sketch")
+        for i in range(count)
+    ]
+    decisions = [
+        {"id": artwork.id, "decision": "approve"} if i % 3 else {"id": artwork.id, "decision": "reject", "feedback": f"Crop #{i}"}
+        for i, artwork in enumerate(artworks)
+    ]
+    decisions.append({"id": 999999, "decision": "approve"})
+    for approval_status in ("approved", "rejected"):
+        for owner in (artist, None):
+            ArtworkCategoryStat.objects.create(category="sketch", approval_status=approval_status, artist=owner)
+    client.force_authenticate(user=admin)
+
+    # savepoint, SELECT ... FOR UPDATE, 2 UPDATEs, 3 rollup buckets x (artist, club), INSERT notifications, release
+    with django_assert_num_queries(12):
+        response = client.post("/api/artwork/bulk_moderate/", {"decisions": decisions}, format="json")
+
+    assert response.status_code == 200
+    rejected = count // 3 + (1 if count % 3 else 0)
+    assert response.data["rejected"] == rejected
+    assert response.data["approved"] == count - rejected
+    assert response.data["results"][-1] == {"id": 999999, "status": "not_found"}
+    assert Artwork.objects.get(pk=artworks[0].pk).feedback == "Crop #0"
+    assert Artwork.objects.get(pk=artworks[1].pk).approval_status == "approved"
+    assert Notification.objects.filter(recipient=artist).count() == count
+    assert category_counts()["sketch"] == {"approved": count - rejected, "pending": 0, "rejected": rejected, "total": count}
+
+
+@pytest.mark.django_db
+def test_bulk_moderate_requires_feedback_for_rejections():
+    client = APIClient()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin")
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    artwork = Artwork.objects.create(title="Art", image="artworks/a.jpg", artist=artist)
+    client.force_authenticate(user=admin)
+
+    response = client.post("/api/artwork/bulk_moderate/", {"decisions": [{"id": artwork.id, "decision": "reject"}]}, format="json")
+
+    assert response.status_code == 400
+    assert Artwork.objects.get(pk=artwork.pk).approval_status == "pending"
+
+
+@pytest.mark.django_db
+def test_artwork_conditional_get_skips_serialization(django_assert_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    artwork = Artwork.objects.create(title="Art", image="artworks/a.jpg", artist=artist, approval_status="approved")
+
+    first = client.get(f"/api/artwork/{artwork.id}/")
+    assert first.status_code == 200
+    with django_assert_num_queries(1):
+        cached = client.get(f"/api/artwork/{artwork.id}/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert cached.status_code == 304
+    assert client.get(f"/api/artwork/{artwork.id}/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code == 304
+
+    listing = client.get("/api/artwork/")
+    with django_assert_num_queries(1):
+        assert client.get("/api/artwork/", HTTP_IF_NONE_MATCH=listing["ETag"]).status_code == 304
+
+    # Like counters change through queryset.update(), which must still move the validators
+    client.force_authenticate(user=liker)
+    client.post(f"/api/artwork/{artwork.id}/like/")
+    client.force_authenticate(user=None)
+    assert client.get(f"/api/artwork/{artwork.id}/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
+    assert client.get("/api/artwork/", HTTP_IF_NONE_MATCH=listing["ETag"]).status_code == 200
+
+    # artist_name comes from the artist row, whose stamp is part of the validators
+    detail = client.get(f"/api/artwork/{artwork.id}/")
+    listing = client.get("/api/artwork/")
+    artist.last_name = "Renamed"
+    artist.save()
+    renamed = client.get(f"/api/artwork/{artwork.id}/", HTTP_IF_NONE_MATCH=detail["ETag"])
+    assert renamed.status_code == 200 and renamed.data["artist_name"].endswith("Renamed")
+    assert client.get("/api/artwork/", HTTP_IF_NONE_MATCH=listing["ETag"]).status_code == 200
+    # Colour rankings come from a file updated_at doesn't track, so they get no validators
+    assert "ETag" not in client.get("/api/artwork/", {"color": "#336699"})
+
+
+def _run_image_jobs():
+    from imaging.worker import make_executor, process_pending
+
+    with make_executor(max_workers=1) as executor:
+        while process_pending(executor):
+            pass
+
+
+def _painting(seed, size=(600, 400), fmt="JPEG"):
+    rng = random.Random(seed)
+    image = Image.new("RGB", (600, 400), (240, 235, 220))
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(600), rng.randrange(400)
+        w, h = rng.randrange(40, 250), rng.randrange(40, 200)
+        draw.ellipse((x, y, x + w, y + h), fill=tuple(rng.randrange(256) for _ in range(3)))
+    buffer = BytesIO()
+    image.resize(size).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db
+def test_near_duplicate_submissions_are_flagged(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    duplicate_index.reset()  # Row ids are reused between tests on SQLite
+    client = APIClient()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin")
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+
+    def upload(name, data):
+        response = client.post("/api/artwork/", {
+            "title": name, "description": "x", "image": SimpleUploadedFile(name, data),
+        }, format="multipart")
+        assert response.status_code == 201
+        return response.data
+
+    original = upload("original.jpg", _painting(1))
+    unrelated = upload("unrelated.jpg", _painting(2))
+    # Re-encoded at a different size and format: bytes differ, the picture doesn't
+    resubmitted = upload("copy.png", _painting(1, size=(450, 300), fmt="PNG"))
+    # Hashing is the image worker's job; the request never decodes the upload
+    assert resubmitted["possible_duplicate_of"] is None
+    _run_image_jobs()
+
+    def flagged(artwork):
+        return client.get(f"/api/artwork/{artwork['id']}/").data["possible_duplicate_of"]
+
+    assert flagged(original) is None
+    assert flagged(unrelated) is None
+    assert flagged(resubmitted) == original["id"]
+
+    client.force_authenticate(user=admin)
+    matches = client.get(f"/api/artwork/{original['id']}/duplicates/").data
+    assert [match["id"] for match in matches] == [resubmitted["id"]]
+    assert matches[0]["distance"] <= settings.ARTWORK_DUPLICATE_MAX_DISTANCE
+
+    # Rows from before hashing existed are covered by the backfill
+    Artwork.objects.update(perceptual_hash="", possible_duplicate_of=None)
+    call_command("backfill_perceptual_hashes")
+    assert Artwork.objects.get(pk=resubmitted["id"]).possible_duplicate_of_id == original["id"]
+    assert Artwork.objects.get(pk=original["id"]).possible_duplicate_of_id is None
+
+
+@pytest.mark.django_db
+def test_trending_ranks_recent_like_velocity(django_assert_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    fans = [
+        CustomUser.objects.create_user(username=f"fan{i}", email=f"fan{i}@example.com", password="password123")
+        for i in range(4)
+    ]
+    old_favourite = Artwork.objects.create(title="Old", image="artworks/a.jpg", artist=artist, approval_status="approved")
+    rising = Artwork.objects.create(title="Rising", image="artworks/b.jpg", artist=artist, approval_status="approved")
+    hidden = Artwork.objects.create(title="Pending", image="artworks/c.jpg", artist=artist, approval_status="pending")
+    now = timezone.now()
+    for fan in fans:
+        Like.objects.create(user=fan, artwork=old_favourite)
+        Like.objects.create(user=fan, artwork=hidden)
+    Like.objects.filter(artwork=old_favourite).update(created_at=now - timedelta(days=3))
+    for fan in fans[:2]:
+        Like.objects.create(user=fan, artwork=rising)
+
+    call_command("compute_trending")
+
+    assert TrendingScore.objects.count() == 2
+    with django_assert_num_queries(2):
+        response = client.get("/api/artwork/trending/")
+    assert [item["title"] for item in response.data["results"]] == ["Rising", "Old"]
+    # Four likes three half-lives ago are worth about half a like today
+    assert response.data["results"][1]["trending_score"] == pytest.approx(0.5, abs=0.01)
+
+
+@pytest.mark.django_db
+def test_batch_likes_and_liked_by_me_use_set_queries(django_assert_num_queries):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    _make_artworks(6, artist, liker)
+    artworks = list(Artwork.objects.order_by("pk"))
+    Like.objects.filter(artwork=artworks[0]).delete()
+    client.force_authenticate(user=liker)
+
+    ids = ",".join(str(artwork.pk) for artwork in artworks) + ",999999"
+    with django_assert_num_queries(2):
+        response = client.get("/api/artworks/likes/", {"ids": ids})
+    likes = response.data["likes"]
+    assert set(likes) == {str(artwork.pk) for artwork in artworks}
+    assert likes[str(artworks[0].pk)] == {"count": 1, "liked": False}
+    assert likes[str(artworks[1].pk)] == {"count": 1, "liked": True}
+    assert client.get("/api/artworks/likes/", {"ids": "1,x"}).status_code == 400
+
+    # One extra query per page for liked_by_me, whatever the page size
+    with django_assert_num_queries(4):
+        page = client.get("/api/artwork/", {"page_size": 6}).data["results"]
+    flags = {item["id"]: item["liked_by_me"] for item in page}
+    assert flags == {artwork.pk: artwork.pk != artworks[0].pk for artwork in artworks}
+
+    client.force_authenticate(user=None)
+    assert client.get(f"/api/artwork/{artworks[1].pk}/").data["liked_by_me"] is False
+    assert all(item["liked_by_me"] is None for item in client.get("/api/featured-artworks/").data["results"])
+
+
+@pytest.mark.django_db
+def test_sparse_fieldsets_trim_payload_and_columns():
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123", first_name="Ada")
+    _make_artworks(3, artist, artist)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/artwork/", {"fields": "title,image_renditions", "page_size": 3})
+    assert [set(item) for item in response.data["results"]] == [{"id", "title", "image_renditions"}] * 3
+    page_sql = queries.captured_queries[-1]["sql"]
+    assert '"description"' not in page_sql and '"feedback"' not in page_sql and '"image"' in page_sql
+
+    omitted = client.get("/api/artwork/", {"omit": "description,feedback,placeholder"}).data["results"][0]
+    assert "description" not in omitted and "placeholder" not in omitted and "title" in omitted
+
+    expanded = client.get("/api/artwork/", {"fields": "artist", "expand": "artist"}).data["results"][0]
+    assert expanded["artist"]["first_name"] == "Ada" and expanded["artist"]["id"] == artist.id
+
+    # Cursor pages still find their position when submission_date itself isn't requested
+    cursor_page = client.get("/api/artwork/", {"pagination": "cursor", "fields": "title", "page_size": 2}).data
+    assert len(client.get(cursor_page["next"]).data["results"]) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_values_list_matches_model_serializer(use_orjson, monkeypatch):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from artwork.serializers import ArtworkSerializer
+    from artwork.views import ArtworkViewSet
+    from users import renderers
+
+    if not use_orjson:
+        monkeypatch.setattr(renderers, "orjson", None)
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123", first_name="Zoë")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    _make_artworks(4, artist, liker)
+    Artwork.objects.filter(pk=Artwork.objects.order_by("pk")[1].pk).update(image="", description="line break")
+    client.force_authenticate(user=liker)
+
+    response = client.get("/api/artwork/", {"page_size": 4})
+    assert response["Content-Type"] == "application/json"
+    request = Request(APIRequestFactory().get("/api/artwork/"))
+    expected = ArtworkSerializer(
+        Artwork.objects.for_listing(), many=True,
+        context={"request": request, "liked_ids": set(Like.objects.values_list("artwork_id", flat=True))},
+    ).data
+    by_id = {item["id"]: item for item in response.json()["results"]}
+    assert by_id == {item["id"]: item for item in expected}
+    assert b"\\u2028" in response.content
+
+    # ?expand= needs nested serializers, so it keeps using ArtworkSerializer
+    assert ArtworkViewSet.values_serializer_class is not None
+    expanded = client.get("/api/artwork/", {"expand": "artist", "fields": "artist"}).json()["results"][0]
+    assert expanded["artist"]["first_name"] == "Zoë"
+
+    notification = Notification.objects.create(recipient=liker, message="Hi", notification_type="event_update")
+    listed = client.get("/api/notifications/").json()
+    assert listed["results"] == [{
+        "id": notification.pk, "recipient": liker.pk, "message": "Hi", "notification_type": "event_update",
+        "created_at": notification.created_at.isoformat().replace("+00:00", "Z"), "read": False,
+    }]
+
+
+@pytest.mark.django_db
+def test_my_artworks_and_liked_are_paginated_and_streamable(django_assert_num_queries):
+    import json
+
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    _make_artworks(5, artist, liker)
+    artworks = list(Artwork.objects.order_by("pk"))
+    # Like times run against id order, so the liked list must follow the join, not the artwork ids
+    now = timezone.now()
+    for age, artwork in enumerate(artworks):
+        Like.objects.filter(artwork=artwork).update(created_at=now - timedelta(hours=len(artworks) - age))
+    client.force_authenticate(user=liker)
+
+    with django_assert_num_queries(2):  # COUNT + one joined SELECT
+        liked = client.get("/api/artworks/liked/", {"page_size": 2}).json()
+    assert liked["total_items"] == 5
+    assert [item["id"] for item in liked["results"]] == [artworks[4].pk, artworks[3].pk]
+    assert all(item["liked_by_me"] for item in liked["results"])
+
+    cursor_page = client.get("/api/artworks/liked/", {"pagination": "cursor", "page_size": 3}).json()
+    rest = client.get(cursor_page["next"]).json()["results"]
+    assert [item["id"] for item in cursor_page["results"] + rest] == [a.pk for a in reversed(artworks)]
+
+    streamed = client.get("/api/artworks/liked/", {"format": "ndjson", "fields": "id"})
+    assert streamed.streaming and streamed["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(streamed.streaming_content).splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": a.pk} for a in reversed(artworks)]
+
+    client.force_authenticate(user=artist)
+    mine = client.get("/api/artwork/my_artworks/", {"page_size": 2}).json()
+    assert mine["total_items"] == 5 and len(mine["results"]) == 2
+    streamed = client.get("/api/artwork/my_artworks/", HTTP_ACCEPT="application/x-ndjson")
+    rows = [json.loads(line) for line in b"".join(streamed.streaming_content).splitlines()]
+    assert len(rows) == 5 and all(row["artist"] == artist.pk for row in rows)
+
+
+@pytest.mark.django_db
+def test_similar_artworks_from_co_likes(django_assert_num_queries):
+    from artwork.models import SimilarArtwork
+    from artwork.similarity import compute_similar_artworks
+
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    users = [
+        CustomUser.objects.create_user(username=f"fan{i}", email=f"fan{i}@example.com", password="password123")
+        for i in range(4)
+    ]
+    a, b, c, d, hidden = (
+        Artwork.objects.create(title=title, description="x", image="artworks/test.jpg", artist=artist, approval_status="approved")
+        for title in "abcdh"
+    )
+    # b shares all of a's likers, c half of them, d none; hidden is co-liked but gets unapproved
+    for user, liked in zip(users, [(a, b, c, hidden), (a, b, hidden), (a, b, c), (d, c)]):
+        for artwork in liked:
+            Like.objects.create(user=user, artwork=artwork)
+
+    # Tiny blocks change how the work is split, not the result
+    compute_similar_artworks(max_pairs=1)
+    stored = set(SimilarArtwork.objects.values_list("artwork_id", "similar_id", "score"))
+    call_command("compute_similar_artworks")
+    assert set(SimilarArtwork.objects.values_list("artwork_id", "similar_id", "score")) == stored
+    Artwork.objects.filter(pk=hidden.pk).update(approval_status="rejected")
+
+    with django_assert_num_queries(2):  # get_object + one joined SELECT
+        response = APIClient().get(f"/api/artwork/{a.pk}/similar/")
+    assert [item["id"] for item in response.data] == [b.pk, c.pk]
+    assert response.data[0]["similarity"] == 1.0
+    assert response.data[1]["similarity"] == round(2 / (3 * 3) ** 0.5, 4)
+
+
+@pytest.mark.django_db
+def test_color_search_ranks_by_histogram(settings, tmp_path, django_capture_on_commit_callbacks):
+    from imaging.jobs import store_image_metadata
+    from imaging.models import ImageJob
+    from imaging.processing import extract_metadata
+    from artwork.palette import color_index
+
+    settings.ARTWORK_COLOR_INDEX_PATH = str(tmp_path / "colors.npy")
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+
+    def solid(name, background, accent):
+        image = Image.new("RGB", (200, 100), background)
+        ImageDraw.Draw(image).rectangle((0, 0, 49, 99), fill=accent)  # A quarter of the picture
+        buffer = BytesIO()
+        image.save(buffer, "PNG")
+        artwork = Artwork.objects.create(
+            title=name, description="x", image=f"artworks/{name}.png", artist=artist, approval_status="approved"
+        )
+        # What the image worker does once the upload is processed
+        job = ImageJob.objects.get(model_label="artwork.Artwork", object_id=artwork.pk)
+        store_image_metadata(job, extract_metadata(buffer.getvalue()))
+        return artwork
+
+    red = solid("red", (220, 20, 20), (20, 20, 220))
+    blue = solid("blue", (20, 20, 220), (220, 20, 20))
+    green = solid("green", (20, 200, 40), (20, 200, 40))
+
+    client = APIClient()
+    results = client.get("/api/artwork/", {"color": "#e01010"}).data["results"]
+    assert [item["id"] for item in results] == [red.pk, blue.pk]
+    results = client.get("/api/artwork/", {"color": "1010e0", "fields": "id"}).data["results"]
+    assert [item["id"] for item in results] == [blue.pk, red.pk]
+    assert [item["id"] for item in client.get("/api/artwork/", {"color": "#14c828"}).data["results"]] == [green.pk]
+    assert client.get("/api/artwork/", {"color": "#14c828", "category": "canvas"}).data["results"] == []
+    assert client.get("/api/artwork/", {"color": "green"}).status_code == 400
+
+    # Ids past the end grow the file; readers pick the replacement up on their next query
+    far = green.pk + 5000
+    color_index.store([far], color_index.load()[green.pk])
+    assert [pk for pk, _ in color_index.search((20, 200, 40), limit=5)] == [green.pk, far]
+
+    # Deleted artworks give up their row, so they can't crowd live ones out of the candidates
+    deleted = [red.pk, green.pk]
+    with django_capture_on_commit_callbacks(execute=True):
+        Artwork.objects.filter(pk=red.pk).delete()
+        green.delete()
+    assert not color_index.load()[deleted].any()
+    assert [pk for pk, _ in color_index.search((220, 20, 20), limit=5)] == [blue.pk]
+    assert [pk for pk, _ in color_index.search((20, 200, 40), limit=5)] == [far]
+
+
+@pytest.mark.django_db
+def test_export_streams_images_and_manifest(settings, tmp_path):
+    import csv
+    import json
+    import zipfile
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    (tmp_path / "artworks").mkdir()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin")
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    other = CustomUser.objects.create_user(username="other", email="other@example.com", password="password123")
+
+    def artwork(title, owner, name, data=None, **extra):
+        if data is not None:
+            (tmp_path / "artworks" / name).write_bytes(data)
+        return Artwork.objects.create(
+            title=title, description="x", image=f"artworks/{name}", artist=owner, approval_status="approved", **extra
+        )
+
+    sunset = artwork("Sunset Over Hills", artist, "sunset.JPG", b"sunset-bytes" * 1000)
+    lost = artwork("Lost", artist, "lost.png")  # Row without a file on disk
+    theirs = artwork("Theirs", other, "theirs.png", b"theirs", category="canvas")
+
+    def export(user, params=None):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get("/api/artwork/export/", params or {})
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/zip"
+        assert response["Content-Disposition"].startswith('attachment; filename="artworks-')
+        return zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+
+    archive = export(artist)
+    assert archive.testzip() is None
+    assert archive.namelist() == [f"images/{sunset.pk}-sunset-over-hills.jpg", "manifest.json"]
+    assert archive.read(f"images/{sunset.pk}-sunset-over-hills.jpg") == b"sunset-bytes" * 1000
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [(row["id"], row["file"]) for row in manifest] == [
+        (sunset.pk, f"images/{sunset.pk}-sunset-over-hills.jpg"), (lost.pk, ""),
+    ]
+    assert manifest[0]["artist"] == artist.pk and manifest[0]["title"] == "Sunset Over Hills"
+
+    # Admins see everyone's work and the gallery filters apply
+    archive = export(admin, {"manifest": "csv", "category": "canvas"})
+    assert archive.namelist() == [f"images/{theirs.pk}-theirs.png", "manifest.csv"]
+    rows = list(csv.DictReader(archive.read("manifest.csv").decode().splitlines()))
+    assert [(int(row["id"]), row["file"]) for row in rows] == [(theirs.pk, f"images/{theirs.pk}-theirs.png")]
+
+    client = APIClient()
+    assert client.get("/api/artwork/export/").status_code in (401, 403)
+    client.force_authenticate(user=artist)
+    assert client.get("/api/artwork/export/", {"manifest": "xml"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_detail_reads_go_through_the_model_cache(django_assert_num_queries, settings):
+    from artwork.cache import artwork_cache
+    from users.caching import user_cache
+
+    settings.MODEL_CACHE_STATS_FLUSH_EVERY = 1
+    artwork_cache.reset_stats()
+    client = APIClient()
+    artist = CustomUser.objects.create_user(
+        username="artist", email="artist@example.com", password="password123", first_name="Ada", last_name="L"
+    )
+    liker = CustomUser.objects.create_user(username="liker", email="liker@example.com", password="password123")
+    artwork = Artwork.objects.create(title="Art", image="artworks/a.jpg", artist=artist, approval_status="approved")
+
+    assert client.get(f"/api/artwork/{artwork.id}/").data["artist_name"] == "Ada L"
+    # Warm: only the updated_at lookup behind the ETag; the row and its artist come from the cache
+    with django_assert_num_queries(1):
+        response = client.get(f"/api/artwork/{artwork.id}/", {"expand": "artist"})
+    assert response.data["artist"]["username"] == "artist"
+    assert artwork_cache.stats()["hits"] == 1
+
+    # Like counters move through queryset.update(); the new updated_at makes the entry stale
+    client.force_authenticate(user=liker)
+    client.post(f"/api/artwork/{artwork.id}/like/")
+    assert client.get(f"/api/artwork/{artwork.id}/").data["likes_count"] == 1
+
+    # A change this process never saw a signal for (another worker, or update()) still
+    # shows up: the ETag lookup reads the artist's stamp and the cached copy is refetched
+    CustomUser.objects.filter(pk=artist.pk).update(last_name="M", updated_at=timezone.now())
+    assert client.get(f"/api/artwork/{artwork.id}/").data["artist_name"] == "Ada M"
+    # Stamp-less reads only live briefly in the per-process default backend
+    assert user_cache.timeout == settings.MODEL_CACHE_LOCAL_TIMEOUT
+
+    # Saving the artist drops the cached user through post_save
+    artist.first_name = "Grace"
+    artist.save()
+    assert client.get(f"/api/artwork/{artwork.id}/").data["artist_name"] == "Grace L"
+    assert client.get(f"/api/users/{artist.id}/").data["first_name"] == "Grace"
+    assert user_cache.get_many([artist.id, liker.id, 10 ** 6]).keys() == {artist.id, liker.id}
+    with django_assert_num_queries(0):
+        assert user_cache.get(str(artist.id)).first_name == "Grace"
+
+    artwork.delete()
+    assert client.get(f"/api/artwork/{artwork.id}/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_deleted_artworks_are_never_flagged_as_originals(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    duplicate_index.reset()
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+
+    def upload(name, data):
+        response = client.post("/api/artwork/", {
+            "title": name, "description": "x", "image": SimpleUploadedFile(name, data),
+        }, format="multipart")
+        assert response.status_code == 201
+        return response.data
+
+    original = upload("original.jpg", _painting(1))
+    upload("unrelated.jpg", _painting(2))
+    _run_image_jobs()  # Loads the original into the in-memory index
+    Artwork.objects.filter(pk=original["id"]).delete()
+
+    # The index still holds the deleted id; it must not end up in the foreign key
+    copy = upload("copy.png", _painting(1, size=(450, 300), fmt="PNG"))
+    _run_image_jobs()
+    artwork = Artwork.objects.get(pk=copy["id"])
+    assert artwork.perceptual_hash and artwork.possible_duplicate_of_id is None
+
+
+@pytest.mark.django_db
+def test_duplicates_are_flagged_when_the_newer_job_finishes_first(settings, tmp_path):
+    from imaging.models import ImageJob
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    duplicate_index.reset()
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+
+    def upload(name, data):
+        response = client.post("/api/artwork/", {
+            "title": name, "description": "x", "image": SimpleUploadedFile(name, data),
+        }, format="multipart")
+        assert response.status_code == 201
+        return response.data
+
+    original = upload("original.jpg", _painting(1))
+    copy = upload("copy.png", _painting(1, size=(450, 300), fmt="PNG"))
+    # Jobs are claimed oldest first; push the original's behind the copy's
+    ImageJob.objects.filter(object_id=original["id"]).update(created_at=timezone.now() + timedelta(hours=1))
+    _run_image_jobs()
+
+    assert Artwork.objects.get(pk=copy["id"]).possible_duplicate_of_id == original["id"]
+    assert Artwork.objects.get(pk=original["id"]).possible_duplicate_of_id is None
+
+
+@pytest.mark.django_db
+def test_duplicate_index_picks_up_hashes_set_later_on_old_rows():
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    old = Artwork.objects.create(title="Old", image="artworks/old.jpg", artist=artist)
+    Artwork.objects.bulk_create([
+        Artwork(title=f"New {i}", image=f"artworks/new{i}.jpg", artist=artist, perceptual_hash=f"{i:016x}")
+        for i in range(1, 151)
+    ])
+    index = DuplicateIndex()
+    assert index.search("ffffffffffffffff", max_distance=0) == []
+
+    # e.g. a retried job or the backfill hashing a row far below the newest id
+    Artwork.objects.filter(pk=old.pk).update(perceptual_hash="ffffffffffffffff", updated_at=timezone.now())
+    assert index.search("ffffffffffffffff", max_distance=0) == [(0, old.pk)]
+
+    # A replaced image moves the row rather than leaving its old hash behind
+    Artwork.objects.filter(pk=old.pk).update(perceptual_hash="fffffffffffffff0", updated_at=timezone.now())
+    assert index.search("ffffffffffffffff", max_distance=0) == []
+    assert index.search("fffffffffffffff0", max_distance=0) == [(0, old.pk)]
+
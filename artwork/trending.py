@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+def decayed_scores(artwork_ids, liked_at, now, half_life_hours):
+    """Sum of 0.5 ** (age / half_life) per artwork, in one vectorised pass.
+
+    `artwork_ids` and `liked_at` (POSIX seconds) are parallel arrays, one entry per like.
+    Returns (unique artwork ids, scores).
+    """
+    ages = (now.timestamp() - np.asarray(liked_at, dtype=np.float64)) / 3600.0
+    weights = np.exp2(-np.clip(ages, 0.0, None) / half_life_hours)
+    ids, slots = np.unique(np.asarray(artwork_ids, dtype=np.int64), return_inverse=True)
+    return ids, np.bincount(slots, weights=weights, minlength=len(ids))
+
+
+def compute_trending(now=None, half_life_hours=None, window_days=None):
+    """Replace the TrendingScore table from the likes inside the window; returns the row count."""
+    from .models import Like, TrendingScore
+
+    now = now or timezone.now()
+    half_life_hours = half_life_hours or settings.TRENDING_HALF_LIFE_HOURS
+    window_days = window_days or settings.TRENDING_WINDOW_DAYS
+
+    rows = list(
+        Like.objects.filter(created_at__gte=now - timedelta(days=window_days), artwork__approval_status="approved")
+        .values_list("artwork_id", "created_at")
+    )
+    if rows:
+        ids, scores = decayed_scores(
+            [artwork_id for artwork_id, _ in rows],
+            [created_at.timestamp() for _, created_at in rows],
+            now,
+            half_life_hours,
+        )
+    else:
+        ids, scores = [], []
+
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create(
+            (TrendingScore(artwork_id=int(pk), score=float(score), computed_at=now) for pk, score in zip(ids, scores)),
+            batch_size=1000,
+        )
+    return len(ids)
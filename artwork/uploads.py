@@ -0,0 +1,46 @@
+import os
+
+from django.conf import settings
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+def upload_dir():
+    path = settings.ARTWORK_UPLOAD_TEMP_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def part_path(session):
+    return os.path.join(upload_dir(), f"{session.pk}.part")
+
+
+def create_part_file(session):
+    # Sized up front so chunks can land at their offsets in any order
+    with open(part_path(session), "wb") as fh:
+        fh.truncate(session.total_size)
+
+
+def write_chunk(session, index, stream, length):
+    """Copy exactly `length` bytes from the request stream into the part file.
+
+    Returns the number of bytes written; the caller rejects the chunk when it is short.
+    Only COPY_BUFFER_SIZE bytes are held in memory at a time.
+    """
+    written = 0
+    with open(part_path(session), "r+b") as fh:
+        fh.seek(index * session.chunk_size)
+        while written < length:
+            data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not data:
+                break
+            fh.write(data)
+            written += len(data)
+    return written
+
+
+def discard_part_file(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
@@ -1,14 +1,23 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ArtworkViewSet, like_artwork, unlike_artwork, get_likes_count, LikedArtworksView, FeaturedArtworkViewSet
+from .views import ArtworkViewSet, like_artwork, unlike_artwork, get_likes_count, batch_likes, LikedArtworksView, FeaturedArtworkViewSet, UploadSessionCreateView, UploadSessionDetailView, UploadChunkView, UploadFinalizeView
 
 router = DefaultRouter()
 router.register(r'artwork', ArtworkViewSet)
 router.register(r'featured-artworks', FeaturedArtworkViewSet, basename='featured-artwork')
 
-urlpatterns = router.urls + [
+# Listed before the router so "uploads" isn't captured as an artwork pk
+upload_urlpatterns = [
+    path("artwork/uploads/", UploadSessionCreateView.as_view(), name="artwork_upload_create"),
+    path("artwork/uploads/<uuid:session_id>/", UploadSessionDetailView.as_view(), name="artwork_upload_detail"),
+    path("artwork/uploads/<uuid:session_id>/chunks/<int:index>/", UploadChunkView.as_view(), name="artwork_upload_chunk"),
+    path("artwork/uploads/<uuid:session_id>/finalize/", UploadFinalizeView.as_view(), name="artwork_upload_finalize"),
+]
+
+urlpatterns = upload_urlpatterns + router.urls + [
     path("artwork/<int:artwork_id>/like/", like_artwork, name="like_artwork"),
     path("artwork/<int:artwork_id>/unlike/", unlike_artwork, name="unlike_artwork"),
     path("artwork/<int:artwork_id>/likes/", get_likes_count, name="get_likes_count"),
     path("artworks/liked/", LikedArtworksView.as_view(), name="liked_artworks"),
+    path("artworks/likes/", batch_likes, name="batch_likes"),
 ]
\ No newline at end of file
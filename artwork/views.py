@@ -1,43 +1,122 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-from users.pagination import CustomPagination
+from users.caching import user_cache
+from users.models import CustomUser
+from users.mixins import ConditionalGetMixin, SparseFieldsetViewMixin, ValuesListMixin
+from users.pagination import CursorOptInMixin, CustomPagination, KeysetPagination
+from users.renderers import FastJSONRenderer, NDJSONRenderer
 from notifications.models import Notification
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Artwork, Like
-from .serializers import ArtworkSerializer
+from .models import Artwork, Like, UploadSession
+from .serializers import ArtworkSerializer, ArtworkValuesSerializer, BulkModerationSerializer, UploadSessionSerializer
+from .cache import artwork_cache, get_featured, invalidate_featured, invalidate_featured_likes, set_featured
+from .duplicates import duplicate_index
+from .export import MANIFEST_FORMATS, stream_archive
+from .stats import adjust as adjust_category_stats, category_counts
+from .search import ArtworkColorFilter, ArtworkSearchFilter
+from .uploads import create_part_file, discard_part_file, part_path, write_chunk
+from django.conf import settings
+from django.core.files import File
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import ListAPIView
 from rest_framework.views import APIView
 from users.permissions import IsAdminUser
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework import status
-from django.db import models
-from django.db.models import Count
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
 
-class ArtworkViewSet(viewsets.ModelViewSet):
-    queryset = Artwork.objects.all()#.order_by("-submission_date")
+MAX_BATCH_LIKE_IDS = 100
+
+
+def liked_ids_for(user, artwork_ids):
+    """Set of the given artwork ids that `user` has liked (one query; none for anonymous users)."""
+    if not user.is_authenticated or not artwork_ids:
+        return set()
+    return set(Like.objects.filter(user=user, artwork_id__in=artwork_ids).values_list("artwork_id", flat=True))
+
+
+class ArtworkCursorPagination(KeysetPagination):
+    ordering = ('-submission_date', '-id')
+
+
+class ArtworkViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, ValuesListMixin, CursorOptInMixin, viewsets.ModelViewSet):
+    queryset = Artwork.objects.for_listing()#.order_by("-submission_date")
     serializer_class = ArtworkSerializer
+    values_serializer_class = ArtworkValuesSerializer  # list() renders values() rows, not model instances
+    values_keep = ('submission_date', 'id')  # Read by the keyset cursor
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     parser_classes = (MultiPartParser, FormParser, JSONParser)  # ✅ Allow file uploads
     pagination_class = CustomPagination  # Use the custom pagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    cursor_pagination_class = ArtworkCursorPagination  # ?pagination=cursor (or any ?cursor=) opts in
+    sparse_keep = ('submission_date',)  # The cursor encodes it, whatever ?fields= asks for
+    conditional_related = ('artist__updated_at',)  # artist_name and ?expand=artist change with the artist row
+    conditional_expansions = ('artist',)
+    filter_backends = [DjangoFilterBackend, ArtworkSearchFilter, ArtworkColorFilter, filters.OrderingFilter]
     
     
     # Enable filtering by approval status and artist
     filterset_fields = ['approval_status', 'artist', 'category']
     
-    # Enable search by title or description
+    # Enable search by title or description (full-text ranked on PostgreSQL)
     search_fields = ['title', 'description']
     
     # Enable ordering by submission date
     ordering_fields = ['submission_date']
 
 
+    def get_serializer(self, *args, **kwargs):
+        # liked_by_me for a whole page costs one Like query, not one per card
+        instance = args[0] if args else None
+        if instance is not None and self.request is not None:
+            artworks = list(instance) if kwargs.get('many') else [instance]
+            kwargs.setdefault('context', self.get_serializer_context())
+            kwargs['context']['liked_ids'] = liked_ids_for(self.request.user, [artwork.pk for artwork in artworks])
+            user_cache.attach(artworks, 'artist')  # No-op when for_listing already joined them
+        return super().get_serializer(*args, **kwargs)
+
+    def get_values_context(self, rows):
+        return {'liked_ids': liked_ids_for(self.request.user, [row['id'] for row in rows])}
+
+    def get_object(self):
+        # retrieve: ConditionalGetMixin has already matched the row against the filters and
+        # read its updated_at, so the cached copy of exactly that version can be served
+        stamp = getattr(self, 'conditional_stamp', None)
+        if self.action != 'retrieve' or stamp is None:
+            return super().get_object()
+        try:
+            artwork = artwork_cache.get(self.kwargs[self.lookup_url_kwarg or self.lookup_field], stamp=stamp)
+            # The ETag lookup read the artist's updated_at too, so that copy is current as well
+            artist_stamp = self.conditional_related_stamps.get('artist__updated_at')
+            artwork.artist = user_cache.get(artwork.artist_id, stamp=artist_stamp)
+        except (Artwork.DoesNotExist, CustomUser.DoesNotExist):
+            raise Http404
+        self.check_object_permissions(self.request, artwork)
+        return artwork
+
+    def use_validators(self):
+        # ?color= ranks by the colour index, a file written after the row's updated_at moves;
+        # a request in between would pin the old ranking to the new ETag
+        return 'color' not in self.request.query_params and super().use_validators()
+
+    def use_list_validators(self):
+        # The COUNT/MAX aggregate behind a list ETag is exactly the scan cursor pages avoid
+        return not isinstance(self.paginator, KeysetPagination)
+
+
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
             print(f"Permissions checked for admin user: {self.request.user.is_staff}")  # ✅ Debugging log
             permission_classes = [IsAuthenticated, IsAdminUser]
+        elif self.action == 'export':
+            permission_classes = [IsAuthenticated]
          
         else:
             permission_classes = [AllowAny]
@@ -45,12 +124,14 @@ class ArtworkViewSet(viewsets.ModelViewSet):
 
     
     def perform_create(self, serializer):
+        # No decoding here: the image worker hashes the upload and flags near-duplicates
         serializer.save(artist=self.request.user)
 
 
     def perform_update(self, serializer):
         print("Updating Artwork with Data:", serializer.validated_data)  # ✅ Debugging log
         instance = serializer.save()
+        invalidate_featured()
         
         if instance.approval_status == 'rejected' and 'feedback' in serializer.validated_data:
             Notification.objects.create(
@@ -73,6 +154,7 @@ class ArtworkViewSet(viewsets.ModelViewSet):
         artwork = self.get_object()
         artwork.approval_status = 'approved'
         artwork.save()
+        invalidate_featured()
 
         # Send Notification
         Notification.objects.create(
@@ -99,6 +181,7 @@ class ArtworkViewSet(viewsets.ModelViewSet):
         artwork.approval_status = 'rejected'
         artwork.feedback = feedback  # Save the feedback
         artwork.save()
+        invalidate_featured()
 
         print("Artwork feedback saved:", artwork.feedback)  # Debugging log
 
@@ -110,26 +193,164 @@ class ArtworkViewSet(viewsets.ModelViewSet):
         return Response({"message": "Artwork rejected successfully."}, status=status.HTTP_200_OK)
 
 
-    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    @action(detail=False, methods=['get'])
+    def trending(self, request):
+        """Approved artworks ranked by the precomputed decayed like velocity (see compute_trending)."""
+        queryset = (
+            Artwork.objects.for_listing()
+            .filter(approval_status='approved', trending__isnull=False)
+            .annotate(trending_score=F('trending__score'))
+            .order_by('-trending_score', '-id')
+        )
+        paginator = self.pagination_class()  # Page numbers: the keyset cursor is tied to submission order
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        data = self.get_serializer(page, many=True).data
+        for item, artwork in zip(data, page):
+            item['trending_score'] = round(artwork.trending_score, 4)
+        return paginator.get_paginated_response(data)
+
+
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Approved artworks most often liked by the same members (see compute_similar_artworks), best first."""
+        artwork = self.get_object()
+        queryset = (
+            Artwork.objects.for_listing()
+            .filter(approval_status='approved', similar_from__artwork=artwork)
+            .annotate(similarity=F('similar_from__score'))
+            .order_by('-similarity', '-id')
+        )
+        similar = list(queryset)
+        data = self.get_serializer(similar, many=True).data
+        for item, match in zip(data, similar):
+            item['similarity'] = round(match.similarity, 4)
+        return Response(data)
+
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated, IsAdminUser])
+    def duplicates(self, request, pk=None):
+        """Artworks whose perceptual hash is within ARTWORK_DUPLICATE_MAX_DISTANCE bits of this one."""
+        artwork = self.get_object()
+        matches = duplicate_index.search(artwork.perceptual_hash, exclude=artwork.pk)
+        # The in-memory index can still hold deleted artworks; in_bulk drops them
+        found = Artwork.objects.for_listing().in_bulk([match_id for _, match_id in matches])
+        matches = [(distance, found[match_id]) for distance, match_id in matches if match_id in found]
+        results = self.get_serializer([match for _, match in matches], many=True).data
+        for item, (distance, _) in zip(results, matches):
+            item["distance"] = distance
+        return Response(results)
+
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated, IsAdminUser])
+    def bulk_moderate(self, request):
+        """Approve/reject many artworks at once.
+
+        Body: {"decisions": [{"id": 1, "decision": "approve"}, {"id": 2, "decision": "reject", "feedback": "..."}]}
+        One locking SELECT, one UPDATE per decision and one notification INSERT, in a single transaction.
+        """
+        serializer = BulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        decisions = {item['id']: item for item in serializer.validated_data['decisions']}
+
+        with transaction.atomic():
+            rows = {
+                row['id']: row
+                for row in Artwork.objects.select_for_update()
+                .filter(id__in=decisions)
+                .values('id', 'title', 'artist_id', 'category', 'approval_status')
+            }
+            now = timezone.now()
+            approve_ids = [pk for pk, item in decisions.items() if pk in rows and item['decision'] == 'approve']
+            reject_ids = [pk for pk, item in decisions.items() if pk in rows and item['decision'] == 'reject']
+
+            if approve_ids:
+                Artwork.objects.filter(id__in=approve_ids).update(approval_status='approved', updated_at=now)
+            if reject_ids:
+                Artwork.objects.filter(id__in=reject_ids).update(
+                    approval_status='rejected',
+                    updated_at=now,
+                    feedback=Case(
+                        *[When(id=pk, then=Value(decisions[pk]['feedback'])) for pk in reject_ids],
+                        output_field=models.TextField(),
+                    ),
+                )
+
+            # update() skips the model signals, so the rollup and feed cache are adjusted here
+            deltas = {}
+            notifications = []
+            for pk, new_status in [(pk, 'approved') for pk in approve_ids] + [(pk, 'rejected') for pk in reject_ids]:
+                row = rows[pk]
+                if row['approval_status'] != new_status:
+                    old_key = (row['category'], row['approval_status'], row['artist_id'])
+                    new_key = (row['category'], new_status, row['artist_id'])
+                    deltas[old_key] = deltas.get(old_key, 0) - 1
+                    deltas[new_key] = deltas.get(new_key, 0) + 1
+                if new_status == 'approved':
+                    message = f"Your artwork '{row['title']}' has been approved."
+                    notification_type = 'artwork_approved'
+                else:
+                    message = f"Your artwork '{row['title']}' has been rejected. Feedback: {decisions[pk]['feedback']}"
+                    notification_type = 'artwork_rejected'
+                notifications.append(Notification(
+                    recipient_id=row['artist_id'], message=message, notification_type=notification_type
+                ))
+            for key, delta in deltas.items():
+                if delta:
+                    adjust_category_stats(key, delta)
+            Notification.objects.bulk_create(notifications)
+            invalidate_featured()
+
+        results = []
+        for pk, item in decisions.items():
+            if pk not in rows:
+                results.append({"id": pk, "status": "not_found"})
+            else:
+                results.append({"id": pk, "status": 'approved' if item['decision'] == 'approve' else 'rejected'})
+        return Response({
+            "approved": len(approve_ids),
+            "rejected": len(reject_ids),
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated],
+            renderer_classes=[FastJSONRenderer, BrowsableAPIRenderer, NDJSONRenderer])
     def my_artworks(self, request):
-        user_artworks = self.queryset.filter(artist=request.user)
-        serializer = self.get_serializer(user_artworks, many=True)
-        return Response(serializer.data)
+        # Paginated like the gallery (filters apply); ?format=ndjson streams the whole collection
+        user_artworks = self.get_queryset().filter(artist=request.user).order_by('-submission_date', '-id')
+        user_artworks = self.filter_queryset(user_artworks)
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return self.stream_response(user_artworks)
+        return self.list_response(user_artworks)
     
     
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream a ZIP of the filtered artworks' images plus a manifest (?manifest=json|csv).
+
+        Takes the gallery's filters; admins export anything, everyone else only their own work.
+        """
+        manifest_format = request.query_params.get('manifest', 'json')
+        if manifest_format not in MANIFEST_FORMATS:
+            return Response({"manifest": [f"Choose one of: {', '.join(MANIFEST_FORMATS)}."]}, status=status.HTTP_400_BAD_REQUEST)
+        artworks = self.filter_queryset(self.get_queryset())
+        if request.user.role != 'admin':
+            artworks = artworks.filter(artist=request.user)
+
+        response = StreamingHttpResponse(
+            stream_archive(artworks, manifest_format, self.get_serializer_context()),
+            content_type='application/zip',
+        )
+        response['Content-Disposition'] = f'attachment; filename="artworks-{timezone.now():%Y%m%d-%H%M%S}.zip"'
+        return response
+
+
     @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
     def category_analytics(self, request):
-        analytics = (
-            Artwork.objects.values("category")
-            .annotate(
-                total=Count("id"),
-                approved=Count("id", filter=models.Q(approval_status="approved")),
-                pending=Count("id", filter=models.Q(approval_status="pending")),
-                rejected=Count("id", filter=models.Q(approval_status="rejected")),
-            )
-            .order_by("category")
-        )
+        # Reads the club-wide rollup rows (at most categories x statuses), not the artwork table
+        counts = category_counts()
+        analytics = [{"category": category, **counts[category]} for category in sorted(counts)]
         return Response(analytics, status=200)
     
     
@@ -139,7 +360,12 @@ class ArtworkViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAuthenticated])
 def like_artwork(request, artwork_id):
     artwork = Artwork.objects.get(id=artwork_id)
-    like, created = Like.objects.get_or_create(user=request.user, artwork=artwork)
+    with transaction.atomic():
+        like, created = Like.objects.get_or_create(user=request.user, artwork=artwork)
+        if created:
+            # Keep the stored counter in step with the Like row (same transaction)
+            Artwork.objects.filter(pk=artwork.pk).update(likes_count=F("likes_count") + 1, updated_at=timezone.now())
+            invalidate_featured_likes(artwork.pk)
     if created:
         return Response({"message": "Artwork liked!"}, status=201)
     return Response({"message": "Already liked!"}, status=400)
@@ -147,35 +373,176 @@ def like_artwork(request, artwork_id):
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
 def unlike_artwork(request, artwork_id):
-    try:
-        like = Like.objects.get(user=request.user, artwork_id=artwork_id)
-        like.delete()
-        return Response({"message": "Like removed!"}, status=200)
-    except Like.DoesNotExist:
-        return Response({"message": "Like not found"}, status=404)
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(user=request.user, artwork_id=artwork_id).delete()
+        if not deleted:
+            return Response({"message": "Like not found"}, status=404)
+        Artwork.objects.filter(pk=artwork_id, likes_count__gt=0).update(likes_count=F("likes_count") - 1, updated_at=timezone.now())
+        invalidate_featured_likes(artwork_id)
+    return Response({"message": "Like removed!"}, status=200)
 
 @api_view(["GET"])
 def get_likes_count(request, artwork_id):
-    count = Like.objects.filter(artwork_id=artwork_id).count()
+    count = Artwork.objects.filter(id=artwork_id).values_list("likes_count", flat=True).first() or 0
     return Response({"likes": count})
 
-class LikedArtworksView(APIView):
+@api_view(["GET"])
+def batch_likes(request):
+    """Like counts and the caller's liked flags for many artworks: ?ids=1,2,3 (up to 100).
+
+    Two set-based queries (stored counters, then the caller's likes) replace one
+    get_likes_count call per card. Unknown ids are left out of the result.
+    """
+    try:
+        ids = {int(value) for value in request.query_params.get("ids", "").split(",") if value.strip()}
+    except ValueError:
+        return Response({"error": "ids must be a comma-separated list of integers."}, status=400)
+    if len(ids) > MAX_BATCH_LIKE_IDS:
+        return Response({"error": f"At most {MAX_BATCH_LIKE_IDS} ids per request."}, status=400)
+
+    counts = dict(Artwork.objects.filter(id__in=ids).values_list("id", "likes_count")) if ids else {}
+    liked = liked_ids_for(request.user, list(counts))
+    return Response({
+        "likes": {str(pk): {"count": count, "liked": pk in liked} for pk, count in counts.items()}
+    })
+
+class LikedArtworkCursorPagination(KeysetPagination):
+    ordering = ('-liked_at', '-id')
+
+
+class LikedArtworksView(ValuesListMixin, CursorOptInMixin, ListAPIView):
+    """The caller's liked artworks, most recently liked first.
+
+    Paginated like the gallery (?pagination=cursor seeks on the like time); ?format=ndjson
+    streams every liked artwork instead.
+    """
     permission_classes = [IsAuthenticated]
+    serializer_class = ArtworkSerializer
+    values_serializer_class = ArtworkValuesSerializer
+    values_keep = ('liked_at', 'id')
+    pagination_class = CustomPagination
+    cursor_pagination_class = LikedArtworkCursorPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer, NDJSONRenderer]
 
-    def get(self, request):
-        user = request.user
-        
-        # ✅ Get all artwork IDs liked by the user
-        liked_artwork_ids = Like.objects.filter(user=user).values_list("artwork_id", flat=True)
+    def get_queryset(self):
+        # One join through the caller's likes (like_user_recent_idx) instead of an id__in subquery
+        return (
+            Artwork.objects.for_listing()
+            .filter(likes__user=self.request.user)
+            .annotate(liked_at=F('likes__created_at'))
+            .order_by('-liked_at', '-id')
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        # Every artwork listed here is liked by the caller, so liked_by_me needs no lookup
+        if args:
+            kwargs.setdefault('context', self.get_serializer_context())
+            kwargs['context']['liked_ids'] = {artwork.pk for artwork in args[0]}
+        return super().get_serializer(*args, **kwargs)
 
-        # ✅ Get the actual artwork objects
-        liked_artworks = Artwork.objects.filter(id__in=liked_artwork_ids)
+    def get_values_context(self, rows):
+        return {'liked_ids': {row['id'] for row in rows}}
 
-        serializer = ArtworkSerializer(liked_artworks, many=True)
-        return Response(serializer.data, status=200)
+    def list(self, request, *args, **kwargs):
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return self.stream_response(self.get_queryset())
+        return super().list(request, *args, **kwargs)
     
     
 class FeaturedArtworkViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Artwork.objects.filter(approval_status="approved").order_by("-submission_date")[:11]  # Get latest 10 featured artworks
+    queryset = Artwork.objects.for_listing().filter(approval_status="approved").order_by("-submission_date")[:11]  # Get latest 10 featured artworks
     serializer_class = ArtworkSerializer
-    permission_classes = [AllowAny]  # Adjust as needed
\ No newline at end of file
+    permission_classes = [AllowAny]  # Adjust as needed
+
+    def list(self, request, *args, **kwargs):
+        # Homepage feed: serve the serialized page from cache; moderation and saves bump its version
+        data = get_featured(request)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            set_featured(request, data)
+        return Response(data)
+
+
+
+class UploadSessionCreateView(APIView):
+    """Start a resumable upload: POST the file's name/size and the artwork details."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        chunk_size = serializer.validated_data.pop("chunk_size", settings.ARTWORK_UPLOAD_CHUNK_SIZE)
+        session = serializer.save(user=request.user, chunk_size=chunk_size)
+        create_part_file(session)
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+
+class UploadSessionDetailView(APIView):
+    """GET reports which chunks the server already has, so a client can resume."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, session_id):
+        session = get_object_or_404(UploadSession, pk=session_id, user=request.user)
+        return Response(UploadSessionSerializer(session).data)
+
+
+class UploadChunkView(APIView):
+    """PUT the raw bytes of chunk <index>; re-sending a chunk simply overwrites it."""
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, session_id, index):
+        session = get_object_or_404(UploadSession, pk=session_id, user=request.user, status="open")
+        if index < 0 or index >= session.chunk_count:
+            return Response({"error": f"Chunk index must be between 0 and {session.chunk_count - 1}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        expected = session.expected_chunk_length(index)
+        if request.META.get("CONTENT_LENGTH") not in (None, "", str(expected)):
+            return Response({"error": f"Chunk {index} must be {expected} bytes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Read the body straight off the socket into the part file (never via request.data)
+        stream = request.stream
+        written = write_chunk(session, index, stream, expected) if stream is not None else 0
+        if written != expected:
+            return Response({"error": f"Chunk {index} was {written} bytes, expected {expected}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            session = UploadSession.objects.select_for_update().get(pk=session.pk)
+            if index not in session.received_chunks:
+                session.received_chunks = sorted(session.received_chunks + [index])
+                session.save(update_fields=["received_chunks", "updated_at"])
+        return Response({"received_chunks": session.received_chunks, "chunk_count": session.chunk_count})
+
+
+class UploadFinalizeView(APIView):
+    """Assemble the chunks into an Artwork once every chunk has arrived."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, session_id):
+        with transaction.atomic():
+            session = get_object_or_404(UploadSession.objects.select_for_update(), pk=session_id, user=request.user)
+            if session.status == "complete":
+                # session.artwork is SET_NULL: the artwork may have been deleted since
+                artwork = Artwork.objects.for_listing().filter(pk=session.artwork_id).first() if session.artwork_id else None
+                if artwork is None:
+                    return Response({"error": "The artwork for this upload no longer exists."}, status=status.HTTP_410_GONE)
+                return Response(ArtworkSerializer(artwork, context={"request": request}).data)
+
+            missing = sorted(set(range(session.chunk_count)) - set(session.received_chunks))
+            if missing:
+                return Response({"error": "Upload is incomplete.", "missing_chunks": missing}, status=status.HTTP_400_BAD_REQUEST)
+
+            with open(part_path(session), "rb") as fh:
+                artwork = Artwork(
+                    title=session.title,
+                    description=session.description,
+                    category=session.category,
+                    artist=request.user,
+                )
+                artwork.image.save(session.filename, File(fh), save=True)
+
+            session.status = "complete"
+            session.artwork = artwork
+            session.save(update_fields=["status", "artwork", "updated_at"])
+
+        discard_part_file(session)
+        return Response(ArtworkSerializer(artwork, context={"request": request}).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:27
+
+import imaging.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_event_cover'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='event_cover',
+            field=models.ImageField(blank=True, null=True, storage=imaging.storage.get_media_storage, upload_to='event_covers/'),
+        ),
+    ]
@@ -1,15 +1,17 @@
 from django.db import models
 from users.models import CustomUser  # ✅ Import your User model
+from imaging.storage import get_media_storage
 
 class Event(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     location = models.CharField(max_length=255)
     date = models.DateField()
-    event_cover = models.ImageField(upload_to="event_covers/", null=True, blank=True)
+    event_cover = models.ImageField(upload_to="event_covers/", storage=get_media_storage, null=True, blank=True)
     attendees = models.ManyToManyField(CustomUser, related_name="events_attending", blank=True)
     creator = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="events_created")  # ✅ Ensure creator is properly defined
     is_completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)  # ETag/Last-Modified source; attendee changes touch it too
 
     def __str__(self):
         return self.title
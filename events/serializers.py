@@ -1,12 +1,22 @@
 from rest_framework import serializers
 from .models import Event
+from users.mixins import SparseFieldsetSerializerMixin
 from users.models import CustomUser  # ✅ Import User model
+from users.serializers import UserSummarySerializer
+from imaging.serializers import RenditionsField
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     attendees = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(), many=True, required=False  # ✅ Handle Many-to-Many attendees correctly
     )
     event_cover = serializers.ImageField(required=False)
+    event_cover_renditions = RenditionsField(source="event_cover")
+
+    expandable_fields = {
+        "creator": (UserSummarySerializer, {}),
+        "attendees": (UserSummarySerializer, {"many": True}),
+    }
+    field_sources = {"event_cover_renditions": ["event_cover"], "attendees": []}
     
     class Meta:
         model = Event
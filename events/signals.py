@@ -0,0 +1,18 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Event
+
+
+@receiver(m2m_changed, sender=Event.attendees.through, dispatch_uid="events.touch_on_attendees")
+def touch_event_on_attendee_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # attendees is part of the serialized event, but editing it never saves the event row
+    if reverse:
+        # instance is a user; on clear the affected events must be read before the rows go
+        if action == "pre_clear":
+            Event.objects.filter(attendees=instance).update(updated_at=timezone.now())
+        elif action in ("post_add", "post_remove"):
+            Event.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+    elif action in ("post_add", "post_remove", "post_clear"):
+        Event.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
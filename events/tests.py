@@ -1,3 +1,64 @@
-from django.test import TestCase
+import pytest
+from rest_framework.test import APIClient
+from events.models import Event
+from users.models import CustomUser
 
-# Create your tests here.
+
+@pytest.mark.django_db
+def test_event_etag_changes_when_attendees_change():
+    client = APIClient()
+    creator = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123")
+    attendee = CustomUser.objects.create_user(username="guest", email="guest@example.com", password="password123")
+    event = Event.objects.create(title="Open studio", description="Drop in", location="Hall", date="2026-11-01", creator=creator)
+
+    first = client.get(f"/api/events/{event.id}/")
+    assert client.get(f"/api/events/{event.id}/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    attendee.events_attending.add(event)
+
+    refreshed = client.get(f"/api/events/{event.id}/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert refreshed.status_code == 200
+    assert refreshed.data["attendees"] == [attendee.id]
+    # Nested users aren't covered by the event's stamp
+    assert "ETag" not in client.get(f"/api/events/{event.id}/", {"expand": "attendees"})
+
+
+@pytest.mark.django_db
+def test_event_update_fans_out_after_commit_in_bulk(settings, django_assert_max_num_queries, django_capture_on_commit_callbacks):
+    from notifications.models import Notification
+
+    settings.NOTIFICATION_FANOUT_BATCH_SIZE = 2
+    client = APIClient()
+    admin = CustomUser.objects.create_user(username="admin", email="admin@example.com", password="password123", role="admin")
+    guests = [
+        CustomUser.objects.create_user(username=f"guest{i}", email=f"guest{i}@example.com", password="password123")
+        for i in range(5)
+    ]
+    event = Event.objects.create(title="Open studio", description="Drop in", location="Hall", date="2026-11-01", creator=admin)
+    event.attendees.set(guests)
+    client.force_authenticate(user=admin)
+
+    def put(**changes):
+        data = {
+            "title": "Open studio", "description": "Drop in", "location": "Hall", "date": "2026-11-01",
+            "attendees": [guest.id for guest in guests], **changes,
+        }
+        response = client.put(f"/api/events/{event.id}/", data, format="multipart")
+        assert response.status_code == 200
+
+    # The request only queues the fan-out: no attendee reads or notification INSERTs
+    with django_capture_on_commit_callbacks() as callbacks, django_assert_max_num_queries(12):
+        put(location="Gallery 2")
+    assert Notification.objects.count() == 0
+    assert len(callbacks) == 1
+
+    settings.NOTIFICATION_FANOUT_SYNC = True
+    callbacks[0]()
+    notified = Notification.objects.filter(notification_type="event_update")
+    assert sorted(notified.values_list("recipient_id", flat=True)) == sorted(guest.id for guest in guests)
+    assert set(notified.values_list("message", flat=True)) == {"The event 'Open studio' has been updated."}
+
+    # Re-saving the same values notifies nobody
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        put(location="Gallery 2")
+    assert callbacks == [] and notified.count() == 5
@@ -1,6 +1,7 @@
-from notifications.models import Notification
+from notifications.fanout import fan_out
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from users.mixins import ConditionalGetMixin, SparseFieldsetViewMixin
 from users.permissions import IsAdminUser
 from .serializers import EventSerializer
 from rest_framework.permissions import IsAuthenticated
@@ -15,28 +16,25 @@ from rest_framework.permissions import AllowAny
 from rest_framework.pagination import PageNumberPagination
 
 
+# Event fields attendees see; changing any of them notifies every attendee
+NOTIFIED_FIELDS = ('title', 'description', 'location', 'date', 'event_cover', 'is_completed')
+
+
+def visible_state(event):
+    return {name: Event._meta.get_field(name).value_to_string(event) for name in NOTIFIED_FIELDS}
+
+
 class EventPagination(PageNumberPagination):
     page_size = 8
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     parser_classes = (MultiPartParser, FormParser)
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     pagination_class = EventPagination
-    
-    
-    def list(self, request):
-        queryset = self.filter_queryset(self.get_queryset())
-
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    sparse_prefetch = {"attendees": "attendees"}
     
     # Enable filtering by date and location
     filterset_fields = ['date', 'location']
@@ -57,12 +55,15 @@ class EventViewSet(viewsets.ModelViewSet):
 
     
     def perform_update(self, serializer):
+        # Attendees hear about edits they can see; attendee-list changes and no-op saves stay quiet
+        before = visible_state(serializer.instance)
         instance = serializer.save()
-        for attendee in instance.attendees.all():
-            Notification.objects.create(
-                recipient=attendee,
+        if visible_state(instance) != before:
+            # Queued until commit and written off-request in bulk, however many attendees there are
+            fan_out(
+                instance.attendees.values_list('pk', flat=True),
                 message=f"The event '{instance.title}' has been updated.",
-                notification_type='event_update'
+                notification_type='event_update',
             )
 
 
@@ -0,0 +1,5 @@
+from django.contrib import admin
+from .models import ImageJob, Blob
+
+admin.site.register(ImageJob)
+admin.site.register(Blob)
@@ -0,0 +1,69 @@
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from PIL import Image, UnidentifiedImageError
+
+from .processing import RENDITIONS, open_image, render_renditions
+
+logger = logging.getLogger(__name__)
+
+
+# Every ImageField that gets responsive renditions ("app_label.Model", field name)
+IMAGE_FIELDS = [
+    ("artwork.Artwork", "image"),
+    ("events.Event", "event_cover"),
+    ("projects.Project", "image"),
+    ("users.CustomUser", "profile_picture"),
+]
+
+# Renditions live next to the media tree under their own prefix; originals are never touched
+derivative_storage = FileSystemStorage(allow_overwrite=True)
+
+
+def rendition_name(name, rendition):
+    """Storage path of one rendition, e.g. artworks/foo.jpg -> derivatives/artworks/foo_thumb.webp"""
+    stem, _ = os.path.splitext(name)
+    return f"derivatives/{stem}_{rendition}.webp"
+
+
+def has_derivatives(name):
+    return all(derivative_storage.exists(rendition_name(name, rendition)) for rendition in RENDITIONS)
+
+
+def save_renditions(name, encoded):
+    for rendition, data in encoded.items():
+        derivative_storage.save(rendition_name(name, rendition), ContentFile(data))
+
+
+def generate_derivatives(field_file, force=False):
+    """Write the thumb/medium/large renditions of an ImageField file in-process.
+
+    Returns True when renditions were written, False when skipped or unreadable.
+    """
+    if not field_file or not field_file.name:
+        return False
+    if not force and has_derivatives(field_file.name):
+        return False
+
+    try:
+        with field_file.storage.open(field_file.name, "rb") as source, open_image(source) as image:
+            encoded = render_renditions(image)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        logger.warning("Could not generate renditions for %s: %s", field_file.name, exc)
+        return False
+
+    save_renditions(field_file.name, encoded)
+    return True
+
+
+def rendition_urls(field_file):
+    """Rendition name -> URL for an ImageField file, or for a stored name from values()."""
+    name = getattr(field_file, "name", field_file)
+    if not name:
+        return None
+    return {
+        rendition: derivative_storage.url(rendition_name(name, rendition))
+        for rendition in RENDITIONS
+    }
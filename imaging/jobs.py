@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import ImageJob
+
+# Claims per job, including ones whose child process died before reporting back
+MAX_ATTEMPTS = 3
+
+# Sent after extracted metadata is written, with `queryset` (the rows that now point at the
+# processed file), `field_name` and the full `metadata` dict, so apps can keep derived data
+# that doesn't live in a model field (e.g. the artwork colour index) in step
+image_metadata_stored = Signal()
+
+
+def enqueue_image_job(instance, field_name):
+    """Queue post-upload processing for one image field of a saved instance.
+
+    The job row is written in the caller's transaction, so it exists exactly when the
+    upload does and survives restarts until a worker picks it up.
+    """
+    job = ImageJob.objects.create(
+        model_label=instance._meta.label,
+        object_id=instance.pk,
+        field_name=field_name,
+        file_name=getattr(instance, field_name).name,
+    )
+    set_processing_status(type(instance), instance.pk, "pending")
+    if hasattr(instance, "processing_status"):
+        instance.processing_status = "pending"
+    return job
+
+
+def set_processing_status(model, pk, status):
+    # Only models that expose a processing_status (currently Artwork) track it
+    if any(field.name == "processing_status" for field in model._meta.concrete_fields):
+        model.objects.filter(pk=pk).exclude(processing_status=status).update(
+            processing_status=status, **touch_fields(model)
+        )
+
+
+# Model field -> key in the worker's metadata; models store whichever of these they define
+METADATA_FIELDS = {
+    "image_width": "width",
+    "image_height": "height",
+    "dominant_color": "dominant_color",
+    "placeholder": "placeholder",
+    "perceptual_hash": "perceptual_hash",
+}
+
+
+def metadata_updates(model, metadata):
+    """update() kwargs that copy extracted image metadata onto the fields `model` defines."""
+    names = {field.name for field in model._meta.concrete_fields}
+    return {field: metadata[key] for field, key in METADATA_FIELDS.items() if field in names and key in metadata}
+
+
+def store_image_metadata(job, metadata):
+    model = apps.get_model(job.model_label)
+    updates = metadata_updates(model, metadata)
+    # Matching on the file name skips rows whose image was replaced while the job ran
+    rows = model.objects.filter(pk=job.object_id, **{job.field_name: job.file_name})
+    if updates and rows.update(**updates, **touch_fields(model)):
+        image_metadata_stored.send(sender=model, queryset=rows, field_name=job.field_name, metadata=metadata)
+
+
+def touch_fields(model):
+    """Extra update() kwargs that bump the row's updated_at (its ETag source), if it has one."""
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        return {"updated_at": timezone.now()}
+    return {}
+
+
+def claim_jobs(limit):
+    """Mark up to `limit` pending jobs as running and return them (oldest first)."""
+    with transaction.atomic():
+        jobs = list(
+            ImageJob.objects.select_for_update(skip_locked=True)
+            .filter(status="pending")
+            .order_by("created_at", "id")[:limit]
+        )
+        now = timezone.now()
+        for job in jobs:
+            job.status = "running"
+            job.attempts += 1
+            job.updated_at = now
+        ImageJob.objects.bulk_update(jobs, ["status", "attempts", "updated_at"])
+    return jobs
+
+
+def recover_stalled_jobs(jobs=None):
+    """Requeue running jobs whose worker stopped mid-batch; returns how many were requeued.
+
+    `jobs` is the caller's own batch (e.g. after its process pool broke); without it only
+    jobs claimed more than IMAGE_JOB_LEASE_TIMEOUT seconds ago are taken, so the jobs of
+    other live workers are left alone. Jobs out of attempts are failed instead: one that
+    keeps killing its child process would otherwise be requeued forever.
+    """
+    stalled = ImageJob.objects.filter(status="running")
+    if jobs is not None:
+        stalled = stalled.filter(pk__in=[job.pk for job in jobs])
+    else:
+        stalled = stalled.filter(updated_at__lt=timezone.now() - timedelta(seconds=settings.IMAGE_JOB_LEASE_TIMEOUT))
+
+    with transaction.atomic():
+        exhausted = list(
+            stalled.select_for_update(skip_locked=True).filter(attempts__gte=MAX_ATTEMPTS)
+            .values_list("pk", "model_label", "object_id")
+        )
+        if exhausted:
+            ImageJob.objects.filter(pk__in=[pk for pk, _, _ in exhausted]).update(
+                status="failed", error="Worker stopped while processing", updated_at=timezone.now()
+            )
+            for _, model_label, object_id in exhausted:
+                set_processing_status(apps.get_model(model_label), object_id, "failed")
+        return stalled.filter(attempts__lt=MAX_ATTEMPTS).update(status="pending", updated_at=timezone.now())
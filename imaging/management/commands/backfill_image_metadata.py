@@ -0,0 +1,64 @@
+from concurrent.futures import as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from imaging.derivatives import IMAGE_FIELDS
+from imaging.jobs import METADATA_FIELDS, image_metadata_stored, metadata_updates, touch_fields
+from imaging.processing import extract_metadata
+from imaging.worker import DECODE_ERRORS, make_executor
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract width/height, dominant colour, placeholder and colour histogram for existing media on a process pool "
+        "and store them on every row that points at each file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Pool size (defaults to the CPU count).")
+        parser.add_argument("--batch-size", type=int, default=100, help="Files submitted to the pool per round.")
+        parser.add_argument("--force", action="store_true", help="Re-extract rows that already have metadata.")
+
+    def handle(self, *args, **options):
+        with make_executor(options["workers"]) as executor:
+            for model_label, field_name in IMAGE_FIELDS:
+                model = apps.get_model(model_label)
+                if not metadata_updates(model, dict.fromkeys(METADATA_FIELDS.values())):
+                    continue  # The model stores none of the metadata fields
+                stored, failed = self.backfill(executor, model, field_name, options)
+                self.stdout.write(f"{model_label}.{field_name}: {stored} file(s) extracted, {failed} unreadable")
+        self.stdout.write(self.style.SUCCESS("Image metadata backfill complete."))
+
+    def backfill(self, executor, model, field_name, options):
+        rows = model.objects.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+        if not options["force"]:
+            rows = rows.filter(image_width__isnull=True)
+        # Several rows can share one (content-addressed) file; extract it once
+        names = list(rows.order_by().values_list(field_name, flat=True).distinct())
+        storage = model._meta.get_field(field_name).storage
+
+        stored = failed = 0
+        for start in range(0, len(names), options["batch_size"]):
+            futures = {}
+            for name in names[start:start + options["batch_size"]]:
+                try:
+                    source = storage.path(name)
+                except NotImplementedError:
+                    with storage.open(name, "rb") as fh:
+                        source = fh.read()
+                futures[executor.submit(extract_metadata, source)] = name
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    metadata = future.result()
+                except (FileNotFoundError, *DECODE_ERRORS) as exc:
+                    self.stderr.write(f"Skipped {name}: {exc}")
+                    failed += 1
+                    continue
+                rows = model.objects.filter(**{field_name: name})
+                rows.update(**metadata_updates(model, metadata), **touch_fields(model))
+                image_metadata_stored.send(sender=model, queryset=rows, field_name=field_name, metadata=metadata)
+                stored += 1
+        return stored, failed
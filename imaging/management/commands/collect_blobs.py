@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from imaging.derivatives import RENDITIONS, derivative_storage, rendition_name
+from imaging.models import Blob
+from imaging.storage import media_storage
+
+
+class Command(BaseCommand):
+    help = "Delete stored blobs that no row references any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24,
+            help="Only collect blobs unreferenced for at least this long (covers uploads still in flight).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="List what would be deleted.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["grace_hours"])
+        candidates = Blob.objects.filter(ref_count=0, updated_at__lte=cutoff).values_list("pk", flat=True)
+
+        collected = 0
+        for pk in list(candidates):
+            with transaction.atomic():
+                # Re-check under lock: an upload may have re-acquired the blob meanwhile
+                blob = Blob.objects.select_for_update().filter(pk=pk, ref_count=0, updated_at__lte=cutoff).first()
+                if blob is None:
+                    continue
+                if options["dry_run"]:
+                    self.stdout.write(f"Would delete {blob.name}")
+                    continue
+                blob.delete()
+                media_storage.delete(blob.name)
+                for rendition in RENDITIONS:
+                    derivative_storage.delete(rendition_name(blob.name, rendition))
+            collected += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Collected {collected} blob(s)."))
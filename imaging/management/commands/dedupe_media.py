@@ -0,0 +1,61 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from imaging.derivatives import IMAGE_FIELDS, generate_derivatives
+from imaging.jobs import touch_fields
+from imaging.storage import BLOB_PREFIX, acquire_blob, media_storage
+
+
+class Command(BaseCommand):
+    help = "Move existing media into the content-addressed blob store and repoint rows at the shared blobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delete-originals",
+            action="store_true",
+            help="Remove the legacy files once every row pointing at them has been repointed.",
+        )
+
+    def handle(self, *args, **options):
+        migrated = {}  # legacy name -> blob name
+        rows = 0
+
+        for model_label, field_name in IMAGE_FIELDS:
+            model = apps.get_model(model_label)
+            field = model._meta.get_field(field_name)
+            names = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .exclude(**{f"{field_name}__startswith": f"{BLOB_PREFIX}/"})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+            for name in list(names):
+                if name == field.default:
+                    continue  # Shared defaults (e.g. the avatar) must stay where new rows expect them
+                if name not in migrated:
+                    if not media_storage.exists(name):
+                        self.stderr.write(f"Missing file, left as is: {name}")
+                        continue
+                    with media_storage.open(name, "rb") as fh:
+                        migrated[name] = media_storage.save(name, fh)
+
+                blob_name = migrated[name]
+                with transaction.atomic():
+                    # update() skips the save signals, so the references are counted here
+                    updated = model.objects.filter(**{field_name: name}).update(
+                        **{field_name: blob_name}, **touch_fields(model)
+                    )
+                    acquire_blob(blob_name, count=updated)
+                rows += updated
+                generate_derivatives(field.attr_class(None, field, blob_name))
+
+        if options["delete_originals"]:
+            for name in migrated:
+                media_storage.delete(name)
+
+        blobs = len(set(migrated.values()))
+        self.stdout.write(self.style.SUCCESS(
+            f"Repointed {rows} row(s): {len(migrated)} file(s) now stored as {blobs} blob(s)."
+        ))
@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from imaging.derivatives import IMAGE_FIELDS, generate_derivatives
+
+
+class Command(BaseCommand):
+    help = "Backfill thumb/medium/large renditions for existing media."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Re-render renditions that already exist.")
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Limit to one model label, e.g. artwork.Artwork (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        for model_label, field_name in IMAGE_FIELDS:
+            if options["models"] and model_label not in options["models"]:
+                continue
+            model = apps.get_model(model_label)
+            # Several rows can point at the same file; render each file once
+            names = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+            field = model._meta.get_field(field_name)
+            generated = 0
+            for name in names.iterator():
+                if generate_derivatives(field.attr_class(None, field, name), force=options["force"]):
+                    generated += 1
+            self.stdout.write(f"{model_label}.{field_name}: {generated} file(s) rendered")
+        self.stdout.write(self.style.SUCCESS("Derivative backfill complete."))
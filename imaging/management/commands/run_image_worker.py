@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from imaging.worker import run_worker
+
+
+class Command(BaseCommand):
+    help = "Process queued image jobs (decode, renditions, metadata) on a local process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Pool size (defaults to the CPU count).")
+        parser.add_argument("--batch-size", type=int, default=20, help="Jobs claimed per batch.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the queue and exit instead of polling.")
+
+    def handle(self, *args, **options):
+        run_worker(
+            max_workers=options["workers"],
+            batch_size=options["batch_size"],
+            poll_interval=options["poll_interval"],
+            once=options["once"],
+        )
+        self.stdout.write(self.style.SUCCESS("Image queue drained."))
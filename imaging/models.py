@@ -0,0 +1,45 @@
+from django.db import models
+
+
+class ImageJob(models.Model):
+    """Post-upload image work (decode, renditions, metadata) queued for the worker pool."""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    model_label = models.CharField(max_length=100)  # e.g. "artwork.Artwork"
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=50)
+    file_name = models.CharField(max_length=255)  # File the job was queued for
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    result = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='imaging_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id} {self.field_name} ({self.status})"
+
+
+class Blob(models.Model):
+    """One stored file, shared by every image field that uploaded the same bytes."""
+
+    digest = models.CharField(max_length=64, unique=True)  # SHA-256 of the content
+    name = models.CharField(max_length=255, unique=True)  # Storage path, e.g. blobs/ab/ab12....jpg
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)  # Rows currently pointing at this blob
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,147 @@
+"""Pure Pillow image work.
+
+Everything here runs inside worker processes, so it must not touch the ORM or settings:
+functions take a path (or bytes) and return plain, picklable data.
+"""
+import base64
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Rendition name -> target width in pixels (never upscaled past the original)
+RENDITIONS = {
+    "thumb": 320,
+    "medium": 768,
+    "large": 1600,
+}
+
+RENDITION_FORMAT = "WEBP"
+RENDITION_QUALITY = 80
+
+HASH_SIZE = 8  # dHash grid: 8x8 horizontal gradients -> 64-bit fingerprint
+
+SUMMARY_SIZE = 64  # Working size for the colour and placeholder work
+PLACEHOLDER_WIDTH = 16  # LQIP: blurred-up by the client while the real image loads
+PLACEHOLDER_QUALITY = 40
+COLOR_BINS = 4  # Levels per RGB channel: 4 ** 3 = 64-bin colour histograms
+
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}  # EXIF orientations that swap width and height
+
+
+def open_image(source):
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    return Image.open(source)
+
+
+def render_renditions(image):
+    """Encode every rendition of an opened image; returns rendition name -> bytes."""
+    image = ImageOps.exif_transpose(image)  # Respect camera orientation
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    encoded = {}
+    # Largest first so each smaller rendition is resampled from an already reduced image
+    for rendition, width in sorted(RENDITIONS.items(), key=lambda item: -item[1]):
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, RENDITION_FORMAT, quality=RENDITION_QUALITY, method=4)
+        encoded[rendition] = buffer.getvalue()
+    return encoded
+
+
+def dominant_color(image):
+    """Most common colour of a small RGB image after median-cut quantisation, as #rrggbb."""
+    quantized = image.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def placeholder(image):
+    """A ~200 byte WebP data URI of the image at PLACEHOLDER_WIDTH pixels wide (LQIP)."""
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    buffer = BytesIO()
+    image.resize((PLACEHOLDER_WIDTH, height), Image.Resampling.LANCZOS).save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def color_histogram(image):
+    """Share of an RGB image's pixels in each of COLOR_BINS ** 3 colour cells (sums to 1).
+
+    Returned as a list of floats (cell index = r * BINS^2 + g * BINS + b) so it can travel
+    through the job queue as JSON.
+    """
+    cells = np.asarray(image, dtype=np.uint8).reshape(-1, 3) // (256 // COLOR_BINS)
+    index = (cells[:, 0].astype(np.int64) * COLOR_BINS + cells[:, 1]) * COLOR_BINS + cells[:, 2]
+    counts = np.bincount(index, minlength=COLOR_BINS ** 3)
+    return [round(float(share), 5) for share in counts / max(1, counts.sum())]
+
+
+def summarize(image):
+    """Colour and placeholder fields for an oriented image (any size; it is reduced first)."""
+    small = image.convert("RGB")
+    small.thumbnail((SUMMARY_SIZE, SUMMARY_SIZE), Image.Resampling.BILINEAR)
+    return {
+        "dominant_color": dominant_color(small),
+        "placeholder": placeholder(small),
+        "color_histogram": color_histogram(small),
+    }
+
+
+def extract_metadata(source):
+    """Display size, perceptual hash, dominant colour and placeholder without a full-resolution decode.
+
+    The size comes from the header (swapped for rotated EXIF orientations); JPEGs are then
+    decoded at reduced scale via draft mode for the colour work.
+    """
+    with open_image(source) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+        image.draft("RGB", (SUMMARY_SIZE * 2, SUMMARY_SIZE * 2))
+        oriented = ImageOps.exif_transpose(image)
+        return {"width": width, "height": height, "perceptual_hash": difference_hash(oriented), **summarize(oriented)}
+
+
+def process_image(source):
+    """Fully decode an upload, extract its metadata and render its renditions."""
+    with open_image(source) as image:
+        image.load()  # Full decode: truncated or corrupt uploads fail here, not in the request
+        oriented = ImageOps.exif_transpose(image)
+        metadata = {
+            "width": oriented.width,  # As displayed, i.e. after EXIF rotation
+            "height": oriented.height,
+            "format": image.format,
+            "mode": image.mode,
+            "perceptual_hash": difference_hash(oriented),
+            **summarize(oriented),
+        }
+        renditions = render_renditions(oriented)
+    return {"metadata": metadata, "renditions": renditions}
+
+
+def perceptual_hash(image):
+    """64-bit difference hash (dHash) of a freshly opened image, as 16 hex digits."""
+    image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))  # JPEG: decode at 1/2..1/8 scale
+    return difference_hash(ImageOps.exif_transpose(image))
+
+
+def difference_hash(image):
+    """dHash of an already oriented image, as 16 hex digits.
+
+    Each pixel of a 9x8 grayscale thumbnail is compared with its right-hand neighbour, so
+    re-encoded, resized or lightly retouched copies land within a few bits of the original.
+    """
+    image = image.convert("L")
+    pixels = np.asarray(image.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS), dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return np.packbits(bits).tobytes().hex()
+
+
+def hash_image(source):
+    with open_image(source) as image:
+        return perceptual_hash(image)
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+from .derivatives import rendition_urls
+
+
+class RenditionsField(serializers.ReadOnlyField):
+    """srcset-style map of rendition name -> URL for an ImageField (pass source=<field>).
+
+    Null until the image worker has written the files, for models that track it in a
+    processing_status field.
+    """
+
+    def get_attribute(self, instance):
+        if getattr(instance, "processing_status", "ready") != "ready":
+            return None
+        return super().get_attribute(instance)
+
+    def to_representation(self, value):
+        urls = rendition_urls(value)
+        if urls is None:
+            return None
+        request = self.context.get("request")
+        if request is not None:
+            urls = {rendition: request.build_absolute_uri(url) for rendition, url in urls.items()}
+        return urls
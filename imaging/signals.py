@@ -0,0 +1,70 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+
+from .derivatives import IMAGE_FIELDS
+from .jobs import enqueue_image_job
+from .storage import acquire_blob, release_blob
+
+
+def _make_receivers(field_name):
+    def remember_file(sender, instance, **kwargs):
+        if field_name not in instance.__dict__:
+            return  # Deferred field; reading it here would cost a query per row
+        instance.__dict__.setdefault("_imaging_files", {})[field_name] = getattr(instance, field_name).name
+
+    def on_save(sender, instance, created=False, update_fields=None, **kwargs):
+        # Saves that don't touch the image (e.g. last_login updates) skip the check entirely
+        if update_fields is not None and field_name not in update_fields:
+            return
+        if field_name not in instance.__dict__:
+            return
+        name = getattr(instance, field_name).name
+        files = instance.__dict__.setdefault("_imaging_files", {})
+        previous = files.get(field_name)
+        if created or name != previous:
+            if name:
+                acquire_blob(name)
+                enqueue_image_job(instance, field_name)
+            if previous and not created:
+                release_blob(previous)
+        files[field_name] = name
+
+    def before_delete(sender, instance, **kwargs):
+        # The stored name, not the instance's: the field may be deferred (queryset deletes,
+        # .only() instances) or changed in memory without being saved
+        stored = sender._base_manager.filter(pk=instance.pk).values_list(field_name, flat=True).first()
+        instance.__dict__.setdefault("_imaging_deleted", {})[field_name] = stored
+
+    def on_delete(sender, instance, **kwargs):
+        release_blob(instance.__dict__.get("_imaging_deleted", {}).get(field_name))
+
+    return remember_file, on_save, before_delete, on_delete
+
+
+for model_label, field_name in IMAGE_FIELDS:
+    model = apps.get_model(model_label)
+    remember_file, on_save, before_delete, on_delete = _make_receivers(field_name)
+    post_init.connect(
+        remember_file,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"imaging.remember.{model_label}.{field_name}",
+    )
+    post_save.connect(
+        on_save,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"imaging.save.{model_label}.{field_name}",
+    )
+    pre_delete.connect(
+        before_delete,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"imaging.before_delete.{model_label}.{field_name}",
+    )
+    post_delete.connect(
+        on_delete,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"imaging.delete.{model_label}.{field_name}",
+    )
@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from artwork.models import Artwork
+from imaging.derivatives import RENDITIONS, derivative_storage, rendition_name
+from imaging.models import Blob, ImageJob
+from imaging.jobs import MAX_ATTEMPTS, recover_stalled_jobs
+from imaging.worker import make_executor, process_pending, run_worker
+from users.models import CustomUser
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def executor():
+    with make_executor(max_workers=1) as executor:
+        yield executor
+
+
+class ChildKillingExecutor(ProcessPoolExecutor):
+    """Runs every job as a child process that dies mid-task, like one killed for memory."""
+
+    def submit(self, fn, *args, **kwargs):
+        return super().submit(os._exit, 1)
+
+
+def _jpeg(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _upload(client, name, data):
+    return client.post("/api/artwork/", {
+        "title": "Upload",
+        "description": "x",
+        "image": SimpleUploadedFile(name, data, content_type="image/jpeg"),
+    }, format="multipart")
+
+
+@pytest.mark.django_db
+def test_upload_is_queued_then_processed_off_request(media_root, executor):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+    data = _jpeg(2000, 1000)
+
+    response = _upload(client, "wide.jpg", data)
+
+    assert response.status_code == 201
+    assert response.data["processing_status"] == "pending"
+    assert response.data["image_renditions"] is None  # Not written yet; URLs would 404
+    artwork = Artwork.objects.get()
+    assert not derivative_storage.exists(rendition_name(artwork.image.name, "thumb"))
+
+    process_pending(executor)
+
+    artwork.refresh_from_db()
+    job = ImageJob.objects.get(model_label="artwork.Artwork", object_id=artwork.pk)
+    assert artwork.processing_status == "ready"
+    assert job.status == "done"
+    assert job.result["width"] == 2000 and job.result["format"] == "JPEG"
+    assert (media_root / artwork.image.name).read_bytes() == data  # Original untouched
+    for rendition, width in RENDITIONS.items():
+        with derivative_storage.open(rendition_name(artwork.image.name, rendition)) as fh:
+            assert Image.open(fh).size == (width, width // 2)
+    assert set(client.get(f"/api/artwork/{artwork.pk}/").data["image_renditions"]) == set(RENDITIONS)
+
+
+@pytest.mark.django_db
+def test_undecodable_upload_fails_job_without_retry(executor):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+
+    assert _upload(client, "broken.jpg", b"not really a jpeg").status_code == 201
+    process_pending(executor)
+
+    artwork = Artwork.objects.get()
+    job = ImageJob.objects.get(model_label="artwork.Artwork", object_id=artwork.pk)
+    assert job.status == "failed" and job.attempts == 1
+    assert artwork.processing_status == "failed"
+    assert client.get(f"/api/artwork/{artwork.pk}/").data["image_renditions"] is None
+    assert client.get("/api/artwork/").data["results"][0]["image_renditions"] is None
+
+
+@pytest.mark.django_db
+def test_job_that_kills_its_child_fails_after_max_attempts(monkeypatch):
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    artwork = Artwork(title="Bomb", description="x", artist=artist)
+    artwork.image.save("bomb.jpg", SimpleUploadedFile("bomb.jpg", _jpeg(100, 80)))
+    monkeypatch.setattr("imaging.worker.make_executor", lambda max_workers=None: ChildKillingExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ))
+
+    run_worker(poll_interval=0, once=True)  # Returns only once the queue is empty
+
+    artwork.refresh_from_db()
+    job = ImageJob.objects.get(model_label="artwork.Artwork", object_id=artwork.pk)
+    assert job.status == "failed" and job.attempts == MAX_ATTEMPTS
+    assert artwork.processing_status == "failed"
+
+
+@pytest.mark.django_db
+def test_recovery_only_takes_expired_leases(settings):
+    settings.IMAGE_JOB_LEASE_TIMEOUT = 60
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    artwork = Artwork.objects.create(title="A", description="x", artist=artist, image="artworks/a.jpg")
+    live, stale, exhausted = (
+        ImageJob.objects.create(
+            model_label="artwork.Artwork", object_id=artwork.pk, field_name="image", file_name=artwork.image.name,
+            status="running", attempts=attempts,
+        )
+        for attempts in (1, 1, MAX_ATTEMPTS)
+    )
+    ImageJob.objects.filter(pk__in=[stale.pk, exhausted.pk]).update(updated_at=timezone.now() - timedelta(minutes=5))
+
+    assert recover_stalled_jobs() == 1
+
+    statuses = dict(ImageJob.objects.filter(pk__in=[live.pk, stale.pk, exhausted.pk]).values_list("pk", "status"))
+    assert statuses == {live.pk: "running", stale.pk: "pending", exhausted.pk: "failed"}
+    assert Artwork.objects.get().processing_status == "failed"
+
+
+@pytest.mark.django_db
+def test_renditions_never_upscale_and_are_serialized(executor):
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    artwork = Artwork(title="Small", description="x", artist=artist)
+    artwork.image.save("small.jpg", SimpleUploadedFile("small.jpg", _jpeg(100, 80)))
+    process_pending(executor)
+
+    with derivative_storage.open(rendition_name(artwork.image.name, "large")) as fh:
+        assert Image.open(fh).size == (100, 80)
+
+    response = APIClient().get(f"/api/artwork/{artwork.id}/")
+    assert set(response.data["image_renditions"]) == set(RENDITIONS)
+    assert response.data["image_renditions"]["thumb"].endswith(rendition_name(artwork.image.name, "thumb"))
+
+
+@pytest.mark.django_db
+def test_backfill_command_renders_existing_files(media_root):
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    (media_root / "artworks").mkdir()
+    (media_root / "artworks" / "legacy.jpg").write_bytes(_jpeg(400, 400))
+    # update() bypasses post_save, like rows that predate the pipeline
+    artwork = Artwork.objects.create(title="Legacy", description="x", artist=artist, image="")
+    Artwork.objects.filter(pk=artwork.pk).update(image="artworks/legacy.jpg")
+
+    call_command("generate_derivatives", model=["artwork.Artwork"])
+
+    assert derivative_storage.exists("derivatives/artworks/legacy_thumb.webp")
+
+
+@pytest.mark.django_db
+def test_identical_uploads_share_one_blob_until_unreferenced(media_root):
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    data = _jpeg(50, 50)
+    first = Artwork(title="One", description="x", artist=artist)
+    first.image.save("copy.jpg", SimpleUploadedFile("copy.jpg", data))
+    second = Artwork(title="Two", description="x", artist=artist)
+    second.image.save("copy.jpg", SimpleUploadedFile("copy.jpg", data))
+
+    assert first.image.name == second.image.name
+    assert first.image.name.startswith("blobs/")
+    assert len(list((media_root / "blobs").glob("*/*.jpg"))) == 1
+    blob = Blob.objects.get()
+    assert blob.ref_count == 2
+
+    first.delete()
+    blob.refresh_from_db()
+    assert blob.ref_count == 1
+    call_command("collect_blobs", grace_hours=0)
+    assert (media_root / second.image.name).exists()
+
+    second.delete()
+    call_command("collect_blobs", grace_hours=0)
+    assert not Blob.objects.exists()
+    assert not (media_root / second.image.name).exists()
+
+
+@pytest.mark.django_db
+def test_deferred_and_queryset_deletes_release_blobs(media_root):
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    data = _jpeg(50, 50)
+    for title in ("One", "Two", "Three"):
+        artwork = Artwork(title=title, description="x", artist=artist)
+        artwork.image.save("copy.jpg", SimpleUploadedFile("copy.jpg", data))
+    assert Blob.objects.get().ref_count == 3
+
+    Artwork.objects.only("pk").get(title="One").delete()  # image deferred on the instance
+    assert Blob.objects.get().ref_count == 2
+    Artwork.objects.filter(title__in=["Two", "Three"]).defer("image").delete()
+    assert Blob.objects.get().ref_count == 0
+
+
+@pytest.mark.django_db
+def test_dedupe_media_repoints_legacy_copies(media_root):
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    (media_root / "artworks").mkdir()
+    data = _jpeg(60, 60)
+    for name in ("dup.jpg", "dup_0dRYxAv.jpg"):
+        (media_root / "artworks" / name).write_bytes(data)
+        artwork = Artwork.objects.create(title=name, description="x", artist=artist, image="")
+        Artwork.objects.filter(pk=artwork.pk).update(image=f"artworks/{name}")
+
+    call_command("dedupe_media", delete_originals=True)
+
+    names = set(Artwork.objects.values_list("image", flat=True))
+    assert len(names) == 1 and next(iter(names)).startswith("blobs/")
+    assert Blob.objects.get().ref_count == 2
+    assert not (media_root / "artworks" / "dup.jpg").exists()
+
+
+@pytest.mark.django_db
+def test_worker_and_backfill_store_layout_metadata(executor):
+    client = APIClient()
+    artist = CustomUser.objects.create_user(username="artist", email="artist@example.com", password="password123")
+    client.force_authenticate(user=artist)
+    artwork_id = _upload(client, "red.jpg", _jpeg(900, 600)).data["id"]
+    assert client.get(f"/api/artwork/{artwork_id}/").data["image_width"] is None
+
+    process_pending(executor)
+
+    data = client.get(f"/api/artwork/{artwork_id}/").data
+    assert (data["image_width"], data["image_height"]) == (900, 600)
+    assert data["dominant_color"] == "#c82828"
+    assert data["placeholder"].startswith("data:image/webp;base64,")
+
+    Artwork.objects.update(image_width=None, image_height=None, dominant_color="", placeholder="")
+    call_command("backfill_image_metadata", workers=1)
+
+    artwork = Artwork.objects.get(pk=artwork_id)
+    assert (artwork.image_width, artwork.image_height, artwork.dominant_color) == (900, 600, data["dominant_color"])
+    assert artwork.placeholder == data["placeholder"]
@@ -0,0 +1,111 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.apps import apps
+from django.db import close_old_connections
+from PIL import Image
+
+from .derivatives import save_renditions
+from .jobs import MAX_ATTEMPTS, claim_jobs, recover_stalled_jobs, set_processing_status, store_image_metadata
+from .processing import process_image
+
+logger = logging.getLogger(__name__)
+
+# Bad uploads fail the same way every time, so they are not retried
+DECODE_ERRORS = (OSError, ValueError, SyntaxError, Image.DecompressionBombError)
+
+
+def _source_for(job):
+    """Path (or bytes, for storages without local paths) of the file a job was queued for.
+
+    Returns None when the row is gone or its file was replaced after the job was queued.
+    """
+    model = apps.get_model(job.model_label)
+    current = model.objects.filter(pk=job.object_id).values_list(job.field_name, flat=True).first()
+    if current != job.file_name:
+        return None
+    storage = model._meta.get_field(job.field_name).storage
+    try:
+        return storage.path(job.file_name)
+    except NotImplementedError:
+        with storage.open(job.file_name, "rb") as fh:
+            return fh.read()
+
+
+def _finish(job, status, result=None, error=""):
+    job.status = status
+    job.result = result or {}
+    job.error = error
+    job.save(update_fields=["status", "result", "error", "updated_at"])
+
+
+def _handle_result(job, future):
+    model = apps.get_model(job.model_label)
+    try:
+        output = future.result()
+    except Exception as exc:  # Anything raised in the child (decode errors, crashes) fails the job
+        logger.warning("Image job %s failed: %s", job.pk, exc)
+        if job.attempts < MAX_ATTEMPTS and not isinstance(exc, DECODE_ERRORS):
+            _finish(job, "pending", error=repr(exc))
+        else:
+            _finish(job, "failed", error=repr(exc))
+            set_processing_status(model, job.object_id, "failed")
+        return
+
+    save_renditions(job.file_name, output["renditions"])
+    _finish(job, "done", result=output["metadata"])
+    store_image_metadata(job, output["metadata"])
+    set_processing_status(model, job.object_id, "ready")
+
+
+def process_pending(executor, batch_size=20):
+    """Claim one batch of jobs, run it on the executor and record the outcomes.
+
+    Returns the number of jobs claimed (0 when the queue is empty).
+    """
+    jobs = claim_jobs(batch_size)
+    futures = {}
+    try:
+        for job in jobs:
+            source = _source_for(job)
+            if source is None:
+                _finish(job, "done", result={"skipped": "superseded"})
+                continue
+            futures[executor.submit(process_image, source)] = job
+
+        for future in as_completed(futures):
+            _handle_result(futures[future], future)
+    except BrokenProcessPool:
+        # Hand back whatever this batch still holds before the caller replaces the pool
+        recover_stalled_jobs(jobs)
+        raise
+    return len(jobs)
+
+
+def make_executor(max_workers=None):
+    # Spawned (not forked) children: they import only imaging.processing and never
+    # inherit the parent's database connections
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_worker(max_workers=None, batch_size=20, poll_interval=2.0, once=False):
+    requeued = recover_stalled_jobs()
+    if requeued:
+        logger.info("Requeued %s stalled image job(s)", requeued)
+
+    while True:
+        with make_executor(max_workers) as executor:
+            try:
+                while True:
+                    close_old_connections()
+                    if process_pending(executor, batch_size):
+                        continue
+                    if once:
+                        return
+                    time.sleep(poll_interval)
+            except BrokenProcessPool:
+                # A child died (e.g. killed for memory); process_pending requeued its batch
+                logger.warning("Image worker pool broke; restarting it")
@@ -0,0 +1,68 @@
+"""Deferred, batched notification fan-out.
+
+Notifying everyone attending a popular event means thousands of rows. fan_out() only
+registers an on_commit callback, so the request that triggers it returns in constant
+time and nothing is sent if its transaction rolls back. After the commit, one background
+thread reads the recipient ids and writes their notifications with bulk_create,
+NOTIFICATION_FANOUT_BATCH_SIZE rows per INSERT.
+
+The queue lives in the web process: fan-outs still queued when it exits normally are
+finished first, but a killed process loses them. NOTIFICATION_FANOUT_SYNC runs them
+inline right after the commit instead (tests, management commands).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def deliver(recipient_ids, message, notification_type, batch_size=None):
+    """Create one notification per recipient id in chunked bulk INSERTs; returns how many were created."""
+    batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+    ids = recipient_ids.iterator(chunk_size=batch_size) if hasattr(recipient_ids, "iterator") else iter(recipient_ids)
+    created = 0
+    while batch := list(islice(ids, batch_size)):
+        Notification.objects.bulk_create([
+            Notification(recipient_id=pk, message=message, notification_type=notification_type) for pk in batch
+        ])
+        created += len(batch)
+    return created
+
+
+def fan_out(recipient_ids, message, notification_type):
+    """Notify `recipient_ids` (ids, or a values_list queryset read only once the work runs) after commit."""
+    transaction.on_commit(lambda: _submit(recipient_ids, message, notification_type))
+
+
+def _submit(recipient_ids, message, notification_type):
+    if settings.NOTIFICATION_FANOUT_SYNC:
+        deliver(recipient_ids, message, notification_type)
+    else:
+        _get_executor().submit(_run, recipient_ids, message, notification_type)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notification-fanout")
+        return _executor
+
+
+def _run(recipient_ids, message, notification_type):
+    try:
+        deliver(recipient_ids, message, notification_type)
+    except Exception:
+        logger.exception("Notification fan-out failed: %s", message)
+    finally:
+        connections.close_all()  # This thread's connections only; the next task opens fresh ones
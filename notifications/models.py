@@ -14,5 +14,13 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # NotificationViewSet lists a recipient's notifications newest first
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_recent_idx'),
+            # Unread badge counts and mark_all_as_read
+            models.Index(fields=['recipient'], condition=models.Q(read=False), name='notif_recipient_unread_idx'),
+        ]
+
     def __str__(self):
         return f"{self.notification_type} - {self.recipient.email}"
@@ -1,5 +1,6 @@
 # notifications/serializers.py
 from rest_framework import serializers
+from users.values import ValuesSerializer
 from .models import Notification
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -16,3 +17,9 @@ class NotificationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"recipient": "Recipient must be provided."})
         
         return super().create(validated_data)
+
+
+class NotificationValuesSerializer(ValuesSerializer):
+    """NotificationSerializer's output built from values() rows, for the list endpoint."""
+    fields = NotificationSerializer.Meta.fields
+    datetime_fields = ('created_at',)
@@ -4,12 +4,17 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.renderers import BrowsableAPIRenderer
+from users.mixins import ValuesListMixin
+from users.renderers import FastJSONRenderer
 from .models import Notification
-from .serializers import NotificationSerializer
+from .serializers import NotificationSerializer, NotificationValuesSerializer
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
+    values_serializer_class = NotificationValuesSerializer  # list() renders values() rows
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
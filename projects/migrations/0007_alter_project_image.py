@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:27
+
+import imaging.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_rename_timestamp_projectprogress_created_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=imaging.storage.get_media_storage, upload_to='project_images/'),
+        ),
+    ]
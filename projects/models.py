@@ -1,6 +1,7 @@
 from django.db import models
 from users.models import CustomUser
 from django.utils import timezone
+from imaging.storage import get_media_storage
 
 class Project(models.Model):
     title = models.CharField(max_length=255)
@@ -10,7 +11,8 @@ class Project(models.Model):
     members = models.ManyToManyField(CustomUser, related_name="projects_participating", blank=True)
     creator = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="projects_created")
     is_completed = models.BooleanField(default=False)
-    image = models.ImageField(upload_to="project_images/", null=True, blank=True)
+    image = models.ImageField(upload_to="project_images/", storage=get_media_storage, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # ETag/Last-Modified source; member and progress changes touch it too
 
 
     def __str__(self):
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import Project, ProjectProgress
+from users.mixins import SparseFieldsetSerializerMixin
 from users.models import CustomUser
+from users.serializers import UserSummarySerializer
+from imaging.serializers import RenditionsField
 
 
 class ProjectProgressSerializer(serializers.ModelSerializer):
@@ -11,13 +14,20 @@ class ProjectProgressSerializer(serializers.ModelSerializer):
 
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     members = serializers.PrimaryKeyRelatedField(
     queryset=CustomUser.objects.all(), many=True, required=False  # ✅ Allow empty members list
     )
     image = serializers.ImageField(required=False, allow_null=True)
+    image_renditions = RenditionsField(source="image")
     updates = ProjectProgressSerializer(many=True, read_only=True)  # ✅ Include progress updates
 
+    expandable_fields = {
+        "creator": (UserSummarySerializer, {}),
+        "members": (UserSummarySerializer, {"many": True}),
+    }
+    field_sources = {"image_renditions": ["image"], "members": [], "updates": []}
+
     class Meta:
         model = Project
         fields = '__all__'
@@ -0,0 +1,25 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Project, ProjectProgress
+
+
+@receiver(m2m_changed, sender=Project.members.through, dispatch_uid="projects.touch_on_members")
+def touch_project_on_member_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # members is part of the serialized project, but editing it never saves the project row
+    if reverse:
+        # instance is a user; on clear the affected projects must be read before the rows go
+        if action == "pre_clear":
+            Project.objects.filter(members=instance).update(updated_at=timezone.now())
+        elif action in ("post_add", "post_remove"):
+            Project.objects.filter(pk__in=pk_set).update(updated_at=timezone.now())
+    elif action in ("post_add", "post_remove", "post_clear"):
+        Project.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=ProjectProgress, dispatch_uid="projects.touch_on_progress_save")
+@receiver(post_delete, sender=ProjectProgress, dispatch_uid="projects.touch_on_progress_delete")
+def touch_project_on_progress(sender, instance, **kwargs):
+    # Progress updates are nested in the project payload
+    Project.objects.filter(pk=instance.project_id).update(updated_at=timezone.now())
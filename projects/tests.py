@@ -1,3 +1,29 @@
-from django.test import TestCase
+import pytest
+from rest_framework.test import APIClient
+from projects.models import Project, ProjectProgress
+from users.models import CustomUser
 
-# Create your tests here.
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [2, 6])
+def test_project_list_expands_members_without_per_row_queries(count, django_assert_num_queries):
+    client = APIClient()
+    creator = CustomUser.objects.create_user(username="lead", email="lead@example.com", password="password123")
+    member = CustomUser.objects.create_user(username="member", email="member@example.com", password="password123", first_name="Lin")
+    for i in range(count):
+        project = Project.objects.create(title=f"Mural {i}", description="Long brief " * 50, creator=creator)
+        project.members.add(member)
+        ProjectProgress.objects.create(project=project, description="Sketched the outline")
+
+    # COUNT, page, then one prefetch each for members and updates (no ETag: members aren't stamped)
+    with django_assert_num_queries(4):
+        response = client.get("/api/projects/", {"expand": "members", "omit": "description"})
+
+    results = response.data["results"]
+    assert len(results) == count
+    assert "description" not in results[0]
+    assert [(item["id"], item["first_name"]) for item in results[0]["members"]] == [(member.id, "Lin")]
+    assert results[0]["updates"][0]["description"] == "Sketched the outline"
+
+    grid = client.get("/api/projects/", {"fields": "title,image"}).data["results"]
+    assert set(grid[0]) == {"id", "title", "image"}
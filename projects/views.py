@@ -1,6 +1,7 @@
 from notifications.models import Notification
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from users.mixins import ConditionalGetMixin, SparseFieldsetViewMixin
 from users.permissions import IsAdminUser
 from .models import Project, ProjectProgress
 from .serializers import ProjectSerializer, ProjectProgressSerializer
@@ -13,11 +14,12 @@ from django.utils import timezone
 from rest_framework.permissions import AllowAny
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     parser_classes = [MultiPartParser, FormParser]
+    sparse_prefetch = {"members": "members", "updates": "updates"}
     
     # Enable filtering by start_date and members
     filterset_fields = ['start_date', 'members']
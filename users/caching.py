@@ -0,0 +1,209 @@
+"""Read-through caching of hot model rows by primary key.
+
+A ModelCache sits in front of one model and works with any Django cache backend (the
+MODEL_CACHE_ALIAS entry of CACHES: local memory by default, Redis or memcached when
+configured). Rows are pickled without their related-object caches, so a cached artwork
+never carries a stale copy of its artist; relations are re-attached from their own cache.
+
+Keys are versioned by MODEL_CACHE_VERSION and a fingerprint of the model's columns, so a
+deploy that changes a model never unpickles rows of the old shape. Saves and deletions
+drop the entry through signals, once immediately and again after the transaction
+commits (a concurrent request may have re-cached the old row in between).
+queryset.update() sends no signal; callers that already read the row's `stamp_field`
+(e.g. ConditionalGetMixin's updated_at) pass it to get(), and an entry stamped
+differently counts as a miss.
+
+Signal invalidation only reaches every worker through a shared backend. With the
+per-process locmem backend other workers keep their copy until it expires, so entries
+there live MODEL_CACHE_LOCAL_TIMEOUT seconds; reads that pass a stamp are always current.
+
+Hits and misses are counted per process and added to shared counters in the cache every
+MODEL_CACHE_STATS_FLUSH_EVERY lookups, so `manage.py model_cache_stats` reports the hit
+rate across all workers without a cache write per request.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import CustomUser
+
+_registry = {}
+
+
+class ModelCache:
+    """Read-through (pk -> instance) cache for `model`; see the module docstring.
+
+    `defer` names columns left out of the cached rows (large or sensitive ones); they load
+    on access like any deferred field. `stamp_field` is the column get(pk, stamp=...)
+    compares against.
+    """
+
+    def __init__(self, model, defer=(), stamp_field=None, timeout=None):
+        self.model = model
+        self.defer = tuple(defer)
+        self.stamp_field = stamp_field
+        self._timeout = timeout
+        self._prefix = None
+        self._lock = threading.Lock()
+        self._pending = {"hits": 0, "misses": 0}
+        _registry[model._meta.label_lower] = self
+
+    @property
+    def cache(self):
+        return caches[settings.MODEL_CACHE_ALIAS]
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        if isinstance(self.cache, LocMemCache):
+            # Per process: a save only clears this worker's copy, others wait for expiry
+            return settings.MODEL_CACHE_LOCAL_TIMEOUT
+        return settings.MODEL_CACHE_TIMEOUT
+
+    @property
+    def prefix(self):
+        # Resolved on first use: the model's fields aren't final until the app registry is ready
+        if self._prefix is None:
+            columns = ",".join(f"{field.attname}:{field.get_internal_type()}" for field in self.model._meta.concrete_fields)
+            fingerprint = hashlib.md5(columns.encode("utf-8")).hexdigest()[:8]
+            self._prefix = f"model:{self.model._meta.label_lower}:v{settings.MODEL_CACHE_VERSION}.{fingerprint}"
+        return self._prefix
+
+    def key(self, pk):
+        return f"{self.prefix}:{pk}"
+
+    def queryset(self):
+        queryset = self.model._default_manager.all()
+        return queryset.defer(*self.defer) if self.defer else queryset
+
+    def get(self, pk, stamp=None):
+        """The row with primary key `pk`, from the cache if possible; raises model.DoesNotExist."""
+        pk = self.model._meta.pk.to_python(pk)
+        instance = self.cache.get(self.key(pk))
+        if instance is not None and (stamp is None or self._stamp(instance) == stamp):
+            self._count(hits=1)
+            return instance
+        self._count(misses=1)
+        instance = self.queryset().get(pk=pk)
+        self.cache.set(self.key(pk), self._detached(instance), self.timeout)
+        return instance
+
+    def get_many(self, pks):
+        """{pk: instance} for the given primary keys; rows that don't exist are left out."""
+        to_python = self.model._meta.pk.to_python
+        keys = {self.key(pk): pk for pk in {to_python(pk) for pk in pks}}
+        if not keys:
+            return {}
+        found = self.cache.get_many(list(keys))
+        instances = {keys[key]: instance for key, instance in found.items()}
+        missing = [pk for pk in keys.values() if pk not in instances]
+        self._count(hits=len(instances), misses=len(missing))
+        if missing:
+            fetched = self.queryset().in_bulk(missing)
+            self.cache.set_many(
+                {self.key(pk): self._detached(instance) for pk, instance in fetched.items()}, self.timeout
+            )
+            instances.update(fetched)
+        return instances
+
+    def attach(self, instances, field_name):
+        """Fill the forward foreign key `field_name` on `instances` from this cache, in one lookup.
+
+        Instances whose relation is already loaded (select_related, assignment) are left alone.
+        """
+        descriptor = getattr(type(instances[0]), field_name) if instances else None
+        attname = descriptor.field.attname if descriptor is not None else None
+        pending = [
+            instance for instance in instances
+            if getattr(instance, attname) is not None and not descriptor.is_cached(instance)
+        ]
+        if not pending:
+            return
+        related = self.get_many(getattr(instance, attname) for instance in pending)
+        for instance in pending:
+            target = related.get(getattr(instance, attname))
+            if target is not None:
+                setattr(instance, field_name, target)
+
+    def invalidate(self, pk):
+        self.invalidate_many([pk])
+
+    def invalidate_many(self, pks):
+        keys = [self.key(pk) for pk in pks]
+        if not keys:
+            return
+        self.cache.delete_many(keys)
+        transaction.on_commit(lambda: self.cache.delete_many(keys))
+
+    def connect(self):
+        """Invalidate on save and delete of the model (call from AppConfig.ready)."""
+        uid = f"{self.model._meta.label_lower}.model_cache"
+        post_save.connect(self._changed, sender=self.model, dispatch_uid=f"{uid}.save", weak=False)
+        post_delete.connect(self._changed, sender=self.model, dispatch_uid=f"{uid}.delete", weak=False)
+
+    def _changed(self, sender, instance, **kwargs):
+        self.invalidate(instance.pk)
+
+    def _stamp(self, instance):
+        return getattr(instance, self.stamp_field) if self.stamp_field else None
+
+    def _detached(self, instance):
+        """A shallow copy without loaded relations or prefetches, for pickling."""
+        copy = self.model.__new__(self.model)
+        copy.__dict__.update(instance.__dict__)
+        copy.__dict__.pop("_prefetched_objects_cache", None)
+        copy._state = type(instance._state)()
+        copy._state.db = instance._state.db
+        copy._state.adding = False
+        return copy
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self._pending["hits"] += hits
+            self._pending["misses"] += misses
+            due = self._pending["hits"] + self._pending["misses"] >= settings.MODEL_CACHE_STATS_FLUSH_EVERY
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Add this process's pending hit/miss counts to the shared counters."""
+        with self._lock:
+            pending, self._pending = self._pending, {"hits": 0, "misses": 0}
+        for name, delta in pending.items():
+            if not delta:
+                continue
+            key = f"{self.prefix}:stats:{name}"
+            self.cache.add(key, 0, timeout=None)
+            try:
+                self.cache.incr(key, delta)
+            except ValueError:  # Evicted between add() and incr()
+                self.cache.add(key, delta, timeout=None)
+
+    def stats(self):
+        """{'hits', 'misses', 'hit_rate'} across every process that has flushed its counts."""
+        self.flush_stats()
+        counts = self.cache.get_many([f"{self.prefix}:stats:hits", f"{self.prefix}:stats:misses"])
+        hits = counts.get(f"{self.prefix}:stats:hits", 0)
+        misses = counts.get(f"{self.prefix}:stats:misses", 0)
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
+
+    def reset_stats(self):
+        with self._lock:
+            self._pending = {"hits": 0, "misses": 0}
+        self.cache.delete_many([f"{self.prefix}:stats:hits", f"{self.prefix}:stats:misses"])
+
+
+def registered_caches():
+    """Every ModelCache created so far, by model label."""
+    return dict(_registry)
+
+
+# Profile pages, artist names and ?expand=artist; the password hash never goes to the cache
+user_cache = ModelCache(CustomUser, defer=("password",), stamp_field="updated_at")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from users.caching import registered_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Report hit/miss counts of the read-through model caches, summed over every worker "
+        "that has flushed its counters. Counts reach the shared totals in batches of "
+        "MODEL_CACHE_STATS_FLUSH_EVERY lookups per process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after reporting.")
+
+    def handle(self, *args, **options):
+        for label, model_cache in sorted(registered_caches().items()):
+            stats = model_cache.stats()
+            rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(f"{label}: {stats['hits']} hits, {stats['misses']} misses, hit rate {rate}")
+            if options["reset"]:
+                model_cache.reset_stats()
+        if options["reset"]:
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
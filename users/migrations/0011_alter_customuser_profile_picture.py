@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:27
+
+import imaging.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_alter_customuser_role'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='profile_picture',
+            field=models.ImageField(default='profile_pictures/default-avatar.png', storage=imaging.storage.get_media_storage, upload_to='profile_pictures/'),
+        ),
+    ]
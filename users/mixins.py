@@ -0,0 +1,277 @@
+import hashlib
+from functools import lru_cache
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .renderers import NDJSONRenderer
+
+
+class ConditionalGetMixin:
+    """Weak ETag / Last-Modified validators for a ModelViewSet's list and retrieve.
+
+    Validators are derived from the `updated_at` column (a single-row lookup for retrieve,
+    a COUNT/MAX aggregate over the filtered queryset for list), so a matching
+    If-None-Match / If-Modified-Since gets a 304 before anything is fetched or serialized.
+    Every write path, including queryset.update() calls, must keep `updated_at` current.
+
+    `conditional_related` lists the stamps of forward-FK rows the representation reads
+    (e.g. "artist__updated_at" for an artist's name); they are folded into the validators.
+    `conditional_expansions` names the ?expand= relations those stamps cover; expanding
+    anything else skips the validators, as does any request use_validators() rejects.
+    """
+    conditional_field = "updated_at"
+    conditional_related = ()
+    conditional_expansions = ()
+
+    def get_etag(self, request, *parts):
+        # The rendered body also depends on the URL (filters, page, absolute links), the
+        # negotiated format and, for per-user fields, who is asking
+        key = ":".join(str(part) for part in (
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            request.user.pk,
+            *parts,
+        ))
+        return 'W/"%s"' % hashlib.md5(key.encode("utf-8")).hexdigest()
+
+    def add_validators(self, response, etag, last_modified=None):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+        return response
+
+    def use_validators(self):
+        """False when the response depends on data the tracked stamps don't cover."""
+        return not (_param_list(self.request, "expand") - set(self.conditional_expansions))
+
+    def use_list_validators(self):
+        return True
+
+    def list(self, request, *args, **kwargs):
+        if not (self.use_validators() and self.use_list_validators()):
+            return super().list(request, *args, **kwargs)
+        related = {f"related_{i}": Max(lookup) for i, lookup in enumerate(self.conditional_related)}
+        summary = (
+            self.filter_queryset(self.get_queryset())
+            .order_by()
+            .aggregate(total=Count("pk"), latest=Max(self.conditional_field), **related)
+        )
+        stamps = [summary["latest"], *(summary[name] for name in related)]
+        # Deletions lower the count without moving MAX(updated_at), so lists only get an ETag
+        etag = self.get_etag(request, summary["total"], *(stamp.isoformat() if stamp else "" for stamp in stamps))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(super().list(request, *args, **kwargs), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_validators():
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            row = (
+                self.filter_queryset(self.get_queryset())
+                .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+                .values_list(self.conditional_field, *self.conditional_related)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            row = None
+        if row is None or row[0] is None:
+            return super().retrieve(request, *args, **kwargs)  # Let get_object() raise the 404
+        # get_object() may use these to validate cached rows
+        self.conditional_stamp = row[0]
+        self.conditional_related_stamps = dict(zip(self.conditional_related, row[1:]))
+
+        etag = self.get_etag(request, *(stamp.isoformat() if stamp else "" for stamp in row))
+        last_modified = int(max(stamp for stamp in row if stamp is not None).timestamp())
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
+
+
+def _param_list(request, name):
+    if request is None:
+        return set()
+    return {value.strip() for value in request.query_params.get(name, "").split(",") if value.strip()}
+
+
+class SparseFieldsetSerializerMixin:
+    """?fields=a,b / ?omit=c trim the representation; ?expand=rel swaps an id for a nested object.
+
+    `expandable_fields` maps a field name to (serializer class, kwargs). `field_sources`
+    lists the model fields a computed field reads, so the view can defer everything else.
+    Only applies to the top-level serializer of a read request.
+    """
+    expandable_fields = {}
+    field_sources = {}
+
+    def _sparse_request(self):
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        root = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        return request if root is None else None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self._sparse_request()
+        if request is None:
+            return fields
+        for name in _param_list(request, "expand") & set(self.expandable_fields):
+            serializer_class, kwargs = self.expandable_fields[name]
+            fields[name] = serializer_class(read_only=True, **kwargs)
+        kept = selected_fields(request, fields)
+        return {name: field for name, field in fields.items() if name in kept}
+
+
+def selected_fields(request, names):
+    """The subset of `names` kept by ?fields= and ?omit= (ids are always kept)."""
+    wanted = _param_list(request, "fields")
+    kept = {name for name in names if not wanted or name in wanted or name in ("id", "pk")}
+    return kept - _param_list(request, "omit")
+
+
+@lru_cache(maxsize=None)
+def _declared_field_names(serializer_class):
+    # Building a ModelSerializer's fields deep-copies every declared field; do it once per class
+    return tuple(serializer_class().get_fields())
+
+
+class SparseFieldsetViewMixin:
+    """Defers the columns (and skips the prefetches) that ?fields= / ?omit= leave unused.
+
+    Pairs with SparseFieldsetSerializerMixin on the view's serializer. `sparse_prefetch`
+    maps a serializer field to the prefetch it needs, e.g. {"updates": "updates"};
+    expanded relations are prefetched unless already select_related. `sparse_keep` names
+    model fields the view itself reads (e.g. a pagination cursor) so they are never deferred.
+    """
+    sparse_prefetch = {}
+    sparse_keep = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.request
+        if request is None or request.method not in SAFE_METHODS:
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        declared = _declared_field_names(serializer_class)
+        kept = selected_fields(request, declared)
+        expand = _param_list(request, "expand") & set(getattr(serializer_class, "expandable_fields", {}))
+        selected = queryset.query.select_related
+        traversed = set(selected) if isinstance(selected, dict) else set()
+
+        for name, lookup in self.sparse_prefetch.items():
+            if name in kept:
+                queryset = queryset.prefetch_related(lookup)
+        for name in expand & kept:
+            if name not in traversed and name not in self.sparse_prefetch:
+                queryset = queryset.prefetch_related(name)
+        if not _param_list(request, "fields") and not _param_list(request, "omit"):
+            return queryset
+
+        sources = getattr(serializer_class, "field_sources", {})
+        needed = set(self.sparse_keep)
+        for name in kept:
+            needed.update(sources.get(name, [name]))
+        model = queryset.model
+        deferred = [
+            field.name for field in model._meta.concrete_fields
+            if not field.primary_key and field.name not in needed and field.name not in traversed
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class ValuesListMixin:
+    """Serves list() from queryset.values() through `values_serializer_class` (see users.values).
+
+    Skips model instantiation and per-field serialization for high-volume lists. When the
+    view's serializer supports sparse fieldsets, ?fields= / ?omit= trim the values too;
+    ?expand= (nested serializers) falls back to the regular list. `values_keep` names
+    lookups the paginator reads (e.g. the cursor fields) so they are always fetched.
+    Actions reuse the same path through list_response() and stream_response().
+    """
+    values_serializer_class = None
+    values_keep = ()
+
+    def use_values_list(self):
+        if self.values_serializer_class is None:
+            return False
+        serializer_class = self.get_serializer_class()
+        expandable = getattr(serializer_class, "expandable_fields", {})
+        return not (_param_list(self.request, "expand") & set(expandable))
+
+    def get_values_serializer(self):
+        keep = None
+        if issubclass(self.get_serializer_class(), SparseFieldsetSerializerMixin):
+            keep = selected_fields(self.request, self.values_serializer_class.fields)
+        return self.values_serializer_class(context=self.get_serializer_context(), keep=keep)
+
+    def get_values_context(self, rows):
+        """Extra serializer context computed from the page's rows (e.g. one batched lookup)."""
+        return {}
+
+    def values_queryset(self, queryset, serializer):
+        lookups = serializer.lookups + [lookup for lookup in self.values_keep if lookup not in serializer.lookups]
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_list():
+            return super().list(request, *args, **kwargs)
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def list_response(self, queryset):
+        """A (paginated) list response for an already filtered queryset, e.g. from an action."""
+        if not self.use_values_list():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        serializer = self.get_values_serializer()
+        queryset = self.values_queryset(queryset, serializer)
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        serializer.context.update(self.get_values_context(rows))
+        data = serializer.to_representation(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def stream_response(self, queryset, chunk_size=500):
+        """Every row of an ordered queryset as NDJSON, fetched and encoded chunk_size rows at a time.
+
+        Memory stays flat however long the list is; batched context (see get_values_context)
+        costs one lookup per chunk.
+        """
+        renderer = NDJSONRenderer()
+        if self.use_values_list():
+            serializer = self.get_values_serializer()
+            rows = self.values_queryset(queryset, serializer).iterator(chunk_size=chunk_size)
+
+            def encode(batch):
+                serializer.context.update(self.get_values_context(batch))
+                return serializer.to_representation(batch)
+        else:
+            rows = queryset.iterator(chunk_size=chunk_size)
+
+            def encode(batch):
+                return self.get_serializer(batch, many=True).data
+
+        def lines():
+            while batch := list(islice(rows, chunk_size)):
+                yield renderer.render(encode(batch))
+
+        return StreamingHttpResponse(lines(), content_type=renderer.media_type)
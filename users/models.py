@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.timezone import now
 from django.db.models import JSONField
+from imaging.storage import get_media_storage
 
  
 class CustomUser(AbstractUser):
@@ -13,8 +14,9 @@ class CustomUser(AbstractUser):
     ]
     email = models.EmailField(unique=True)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='visitor')
-    profile_picture = models.ImageField(upload_to='profile_pictures/', default="profile_pictures/default-avatar.png")
+    profile_picture = models.ImageField(upload_to='profile_pictures/', storage=get_media_storage, default="profile_pictures/default-avatar.png")
     notification_preferences = JSONField(default=dict)  # Store notification settings
+    updated_at = models.DateTimeField(auto_now=True)  # Folded into artwork ETags (artist names, ?expand=artist)
     
     USERNAME_FIELD = "email"  # Use email to log in
     REQUIRED_FIELDS = []  # Remove username from required fields
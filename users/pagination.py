@@ -1,5 +1,12 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 
 class CustomPagination(PageNumberPagination):
     page_size = 10
@@ -15,3 +22,145 @@ class CustomPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+class CursorOptInMixin:
+    """Page numbers by default; ?pagination=cursor (or any ?cursor=) switches a view to keyset pages."""
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params if self.request is not None else {}
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination that seeks on the ordering key instead of using OFFSET.
+
+    `ordering` must end in a unique field (e.g. ('-submission_date', '-id')) so every row
+    has a distinct position. The paginator never runs COUNT(*) unless the client asks for
+    it with ?with_count=true, so page N costs the same as page 1.
+    """
+    ordering = ('-id',)
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    cursor_query_param = 'cursor'
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        reverse, position = self.decode_cursor(request)
+
+        self.total_items = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.total_items = queryset.count()
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, self._parse_position(queryset, position)))
+
+        # One extra row tells us whether another page follows, without counting
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = position is not None, has_more
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def _parse_position(self, queryset, position):
+        """Cursor values converted by their ordering fields; 404 for anything they reject."""
+        values = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            if name in queryset.query.annotations:
+                model_field = queryset.query.annotations[name].output_field
+            else:
+                model_field = queryset.model._meta.get_field(name)
+            try:
+                value = model_field.to_python(value)
+            except (DjangoValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def _seek(self, ordering, position):
+        """Q for rows strictly after `position` in `ordering` (a lexicographic comparison)."""
+        condition = None
+        equal_so_far = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = equal_so_far & Q(**{f'{name}__{lookup}': value})
+            condition = step if condition is None else condition | step
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    def _position(self, obj):
+        values = []
+        for field in self.ordering:
+            # Pages are model instances, or dicts when the view lists from values()
+            value = obj[field.lstrip('-')] if isinstance(obj, dict) else getattr(obj, field.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return values
+
+    def encode_cursor(self, reverse, obj):
+        payload = json.dumps({'r': int(reverse), 'p': self._position(obj)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            reverse, position = bool(payload['r']), payload['p']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def get_paginated_response(self, data):
+        body = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.total_items is not None:
+            body['total_items'] = self.total_items
+        return Response(body)
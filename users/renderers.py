@@ -0,0 +1,46 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional: without it the stdlib encoder is used
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Compact JSON encoded by orjson when it is installed, DRF's JSONRenderer otherwise.
+
+    Types orjson doesn't know (lazy strings, Decimal, ...) and datetimes are handed to DRF's
+    encoder, so clients see the same document JSONRenderer would produce. Indented
+    output (?indent= / Accept: ...; indent=N) also goes through the stdlib path.
+    """
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        # JSONRenderer escapes these so the body can be embedded in a <script> tag
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """Newline-delimited JSON (?format=ndjson or Accept: application/x-ndjson): one object per line.
+
+    Views usually answer this format with a StreamingHttpResponse (see
+    users.mixins.ValuesListMixin.stream_response); anything rendered through a Response,
+    such as an error body, becomes a single line.
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        return b"".join(super(NDJSONRenderer, self).render(item) + b"\n" for item in items)
@@ -1,12 +1,15 @@
 from rest_framework import serializers
 from .models import CustomUser, ActivityLog
+from imaging.serializers import RenditionsField
+from .values import ValuesSerializer
 
 class UserSerializer(serializers.ModelSerializer):
     profile_picture = serializers.SerializerMethodField()
+    profile_picture_renditions = RenditionsField(source="profile_picture")
 
     class Meta:
         model = CustomUser
-        fields = ["pk", "username", "email", "first_name", "last_name", "is_staff", "is_superuser", "role", "profile_picture", "is_active"]
+        fields = ["pk", "username", "email", "first_name", "last_name", "is_staff", "is_superuser", "role", "profile_picture", "profile_picture_renditions", "is_active"]
         extra_kwargs = {
             'role': {'read_only': False},  # Allow role to be set during registration
             'is_active': {'read_only': False},  # Allow is_active to be set during registration
@@ -19,12 +22,22 @@ class UserSerializer(serializers.ModelSerializer):
         return None
         
         
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Public face of a user for ?expand= on artworks, events and projects."""
+    profile_picture_renditions = RenditionsField(source="profile_picture")
+
+    class Meta:
+        model = CustomUser
+        fields = ["id", "username", "first_name", "last_name", "profile_picture_renditions"]
+
+
 class ProfileUpdateSerializer(serializers.ModelSerializer):
     profile_picture_url = serializers.SerializerMethodField()  # ✅ Return full image URL
+    profile_picture_renditions = RenditionsField(source="profile_picture")
 
     class Meta:
         model = CustomUser
-        fields = ["first_name", "last_name", "email", "password", "profile_picture", "profile_picture_url"]
+        fields = ["first_name", "last_name", "email", "password", "profile_picture", "profile_picture_url", "profile_picture_renditions"]
         extra_kwargs = {
             'password': {'write_only': True, 'required': False},
         }
@@ -53,6 +66,12 @@ class ActivityLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = ActivityLog
         fields = ['id', 'user', 'action', 'resource', 'timestamp']
+
+
+class ActivityLogValuesSerializer(ValuesSerializer):
+    """ActivityLogSerializer's output built from values() rows, for the list endpoint."""
+    fields = ActivityLogSerializer.Meta.fields
+    datetime_fields = ('timestamp',)
         
         
         
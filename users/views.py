@@ -7,7 +7,11 @@ from .permissions import IsManagerUser
 from rest_framework.generics import ListAPIView
 from rest_framework import status
 from .models import CustomUser, ActivityLog
-from .serializers import UserSerializer, ProfileUpdateSerializer, ActivityLogSerializer
+from .serializers import UserSerializer, ProfileUpdateSerializer, ActivityLogSerializer, ActivityLogValuesSerializer
+from .caching import user_cache
+from .mixins import ValuesListMixin
+from .renderers import FastJSONRenderer
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate
@@ -15,6 +19,7 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import Count, Q
 from rest_framework.views import APIView
 from artwork.models import Artwork
+from artwork.stats import category_counts as artwork_category_counts
 from events.models import Event
 from projects.models import Project
 from django.utils.timezone import now, timedelta
@@ -90,7 +95,7 @@ class UserDetailView(APIView):
     def get(self, request, pk=None):  # ✅ Accept pk argument
         try:
             if pk:
-                user = CustomUser.objects.get(pk=pk)
+                user = user_cache.get(pk)
             else:
                 user = request.user  # Default to current user if no pk is provided
 
@@ -172,9 +177,11 @@ class ProfileUpdateView(APIView):
 
 
 
-class ActivityLogListView(ListAPIView):
+class ActivityLogListView(ValuesListMixin, ListAPIView):
     queryset = ActivityLog.objects.all().order_by('-timestamp')
     serializer_class = ActivityLogSerializer
+    values_serializer_class = ActivityLogValuesSerializer  # list() renders values() rows
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     permission_classes = [IsAdminUser]
     
     
@@ -250,11 +257,14 @@ class MemberStatsView(APIView):
         if request.user.role not in ["member", "admin"]:
             return Response({"error": "Access denied"}, status=403)
 
+        # Per-category/status counts come from the rollup table (a handful of rows per member)
+        category_counts = artwork_category_counts(artist=request.user)
+
         # Total Artworks Submitted
-        total_artworks = Artwork.objects.filter(artist=request.user).count()
+        total_artworks = sum(bucket["total"] for bucket in category_counts.values())
 
         # Approval Rate
-        approved_artworks = Artwork.objects.filter(artist=request.user, approval_status="approved").count()
+        approved_artworks = sum(bucket["approved"] for bucket in category_counts.values())
         approval_rate = (approved_artworks / total_artworks) * 100 if total_artworks > 0 else 0
 
         
@@ -269,9 +279,9 @@ class MemberStatsView(APIView):
         )
         
         # Category Distribution
-        category_stats = Artwork.objects.filter(artist=request.user).values("category").annotate(
-            count=Count("category")
-        )
+        category_stats = [
+            {"category": category, "count": bucket["total"]} for category, bucket in sorted(category_counts.items())
+        ]
 
         # Recent Activity Logs
         activity_logs = ActivityLog.objects.filter(user=request.user).order_by("-timestamp")[:5]
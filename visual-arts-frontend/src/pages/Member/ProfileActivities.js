@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from "react";
-import API from "../../services/api";
+import API, { getMyArtworks } from "../../services/api";
 
 const ProfileActivities = () => {
   const [artworks, setArtworks] = useState([]);
@@ -9,9 +9,9 @@ const ProfileActivities = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const artworksResponse = await API.get("artwork/my_artworks/");
+        const myArtworks = await getMyArtworks({ fields: "id,title,approval_status" });
         const eventsResponse = await API.get("events/my_events/");
-        setArtworks(artworksResponse.data);
+        setArtworks(myArtworks);
         setEvents(eventsResponse.data);
       } catch (error) {
         console.error("Error fetching activities:", error);
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef } from "react";
 import { useSelector } from "react-redux";
-import API from "../../services/api";
+import API, { getLikedArtworks } from "../../services/api";
 import { Image, Button, Select, Skeleton, Empty } from "antd";
 import { HeartFilled, DownloadOutlined } from "@ant-design/icons";
 import "../../styles/mansory-layout.css";
@@ -78,9 +78,9 @@ const VisitorGallery = () => {
     // Fetch user's liked artworks
     const fetchUserLikedArtworks = async () => {
         try {
-            const response = await API.get("/artworks/liked/");
-            console.log("User Liked Artworks Response:", response.data); // Log the response data
-            const likedIds = response.data.reduce((acc, artwork) => {
+            const likedArtworks = await getLikedArtworks({ fields: "id" });
+            console.log("User Liked Artworks Response:", likedArtworks); // Log the response data
+            const likedIds = likedArtworks.reduce((acc, artwork) => {
                 acc[artwork.id] = 1; // Mark the artwork as liked
                 return acc;
             }, {});
@@ -1,6 +1,6 @@
 // artworkslice.js
 import { createSlice, createAsyncThunk } from "@reduxjs/toolkit";
-import { getArtworks, createArtwork, updateArtwork, deleteArtwork } from "../../services/api";
+import { getArtworks, createArtwork, updateArtwork, deleteArtwork, getLikedArtworks } from "../../services/api";
 import API from "../../services/api";
 
 export const fetchAllArtworks = createAsyncThunk("artwork/fetchAll", async (_, thunkAPI) => {
@@ -69,9 +69,9 @@ export const fetchCategoryAnalytics = createAsyncThunk(
 
 export const fetchLikedArtworks = createAsyncThunk("artwork/fetchLiked", async (_, thunkAPI) => {
   try {
-    const response = await API.get("artworks/liked/");
-    console.log("Liked Artworks Response:", response.data);
-    return response.data;
+    const likedArtworks = await getLikedArtworks();
+    console.log("Liked Artworks Response:", likedArtworks);
+    return likedArtworks;
   } catch (error) {
     console.error("Error Fetching Liked Artworks:", error.response?.data || error.message);
     return thunkAPI.rejectWithValue(error.response?.data || "Failed to fetch liked artworks");
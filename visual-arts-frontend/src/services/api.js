@@ -52,6 +52,14 @@ export const updateArtwork = async (id, data) => {
 };
 export const deleteArtwork = (id) => API.delete(`artwork/${id}/`);
 
+// Whole collections as NDJSON (one artwork per line) instead of page by page
+export const getAll = async (url, params = {}) => {
+  const response = await API.get(url, { params: { ...params, format: "ndjson" }, responseType: "text" });
+  return response.data.split("\n").filter(Boolean).map((line) => JSON.parse(line));
+};
+export const getMyArtworks = (params) => getAll("artwork/my_artworks/", params);
+export const getLikedArtworks = (params) => getAll("artworks/liked/", params);
+
 // CRUD for Events
 export const getEvents = () => API.get("events/");
 export const createEvent = (data) => API.post("events/", data);
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'django.contrib.sites',
@@ -58,6 +59,7 @@ INSTALLED_APPS = [
     "projects",
     "logs",
     "notifications",
+    "imaging",
 ]
 
 
@@ -145,6 +147,16 @@ DATABASES = {
     }
 }
 
+# SQLite fallback for running the test suite without a PostgreSQL server (USE_SQLITE=1 pytest).
+# PostgreSQL-only features (e.g. full-text search) fall back to their portable versions.
+if os.environ.get("USE_SQLITE"):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -202,3 +214,54 @@ DEFAULT_FROM_EMAIL = 'Visual Arts <visualarts@gmail.com>'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+
+# Resumable artwork uploads: chunks are written straight to a part file here
+ARTWORK_UPLOAD_TEMP_DIR = os.path.join(BASE_DIR, 'tmp', 'uploads')
+ARTWORK_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024  # 5 MB
+ARTWORK_UPLOAD_MAX_SIZE = 200 * 1024 * 1024  # 200 MB
+
+# Image worker: a job still marked running this many seconds after it was claimed belongs to
+# a worker that died; any worker's startup sweep requeues it (or fails it after its last attempt)
+IMAGE_JOB_LEASE_TIMEOUT = 60 * 15
+
+# Near-duplicate detection: max differing bits (of 64) between perceptual hashes
+ARTWORK_DUPLICATE_MAX_DISTANCE = 10
+
+# Trending ranking (compute_trending): a like's weight halves every TRENDING_HALF_LIFE_HOURS,
+# and likes older than TRENDING_WINDOW_DAYS are ignored
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_WINDOW_DAYS = 7
+
+# Co-like recommendations (compute_similar_artworks): neighbours stored per artwork
+SIMILAR_ARTWORKS_TOP_K = 12
+
+# Colour search (?color=#rrggbb): one memory-mapped histogram row per artwork id, and how many
+# of the closest artworks a query returns
+ARTWORK_COLOR_INDEX_PATH = os.path.join(BASE_DIR, 'var', 'artwork_colors.npy')
+ARTWORK_COLOR_SEARCH_LIMIT = 500
+
+
+# Cache framework: per-process memory by default; point this at Redis/Memcached in production
+# so every worker shares the featured feed and its version stamp. Under locmem an invalidation
+# only reaches the worker that made it; the others serve their copy until it expires.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'visual-arts',
+    }
+}
+FEATURED_ARTWORKS_CACHE_TIMEOUT = 60 * 10  # Shared backends: a safety net; moderation, saves and likes on featured artworks invalidate immediately
+FEATURED_ARTWORKS_LOCAL_CACHE_TIMEOUT = 30  # locmem: the most a worker that missed the invalidation serves a stale feed
+
+# Read-through cache of hot rows (users.caching.ModelCache): artwork detail, user detail, artist names.
+# Give it its own CACHES alias (e.g. Redis) to share rows across workers without touching the feed cache.
+MODEL_CACHE_ALIAS = 'default'
+MODEL_CACHE_TIMEOUT = 60 * 15  # Shared backends: saves and deletes clear the row for every worker
+MODEL_CACHE_LOCAL_TIMEOUT = 30  # locmem is per process: other workers serve a changed row until it expires
+MODEL_CACHE_VERSION = 1  # Bump to retire every cached row at once
+MODEL_CACHE_STATS_FLUSH_EVERY = 100  # Lookups counted locally before the shared hit/miss counters are updated
+
+# Event-update notifications are written after commit by a background thread, in bulk INSERTs
+NOTIFICATION_FANOUT_BATCH_SIZE = 1000
+NOTIFICATION_FANOUT_SYNC = False  # True: write them inline right after the commit (tests)